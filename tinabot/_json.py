@@ -0,0 +1,44 @@
+"""JSON encode/decode shared by the persistence modules.
+
+Uses orjson when installed (the ``fast`` extra) and falls back to the
+stdlib; both produce the same UTF-8 bytes layout.
+"""
+
+from __future__ import annotations
+
+import json
+from typing import Any
+
+try:  # optional: faster parse/serialize
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def loads(data: bytes | str) -> Any:
+    """Parse JSON from bytes or str."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def dumps(obj: Any, *, indent: bool = False, newline: bool = False) -> bytes:
+    """Serialize to UTF-8 bytes.
+
+    Compact by default; ``indent`` uses two spaces for human-edited files,
+    ``newline`` appends a trailing "\\n" (JSON lines, text-friendly files).
+    """
+    if orjson is not None:
+        option = 0
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        if newline:
+            option |= orjson.OPT_APPEND_NEWLINE
+        return orjson.dumps(obj, option=option)
+    if indent:
+        text = json.dumps(obj, indent=2, ensure_ascii=False)
+    else:
+        text = json.dumps(obj, separators=(",", ":"), ensure_ascii=False)
+    if newline:
+        text += "\n"
+    return text.encode("utf-8")
@@ -0,0 +1,15 @@
+"""Small helpers shared across modules; imports nothing heavy."""
+
+from __future__ import annotations
+
+import inspect
+from typing import Any, Callable
+
+
+def is_async_callable(fn: Callable[..., Any] | None) -> bool:
+    """Return True if calling ``fn`` yields an awaitable that must be awaited."""
+    if fn is None:
+        return False
+    return inspect.iscoroutinefunction(fn) or inspect.iscoroutinefunction(
+        getattr(fn, "__call__", None)
+    )
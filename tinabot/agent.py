@@ -3,15 +3,31 @@
 from __future__ import annotations
 
 import asyncio
-from collections.abc import AsyncIterator
-from dataclasses import dataclass, field
+import functools
+import io
+from collections import Counter, OrderedDict
+from collections.abc import AsyncIterator, Mapping
+from dataclasses import dataclass, field, replace
 from pathlib import Path
-from typing import Any, Callable, Awaitable
-
+from types import MappingProxyType
+from typing import Any, Callable, Awaitable, NamedTuple
+
+from claude_agent_sdk import (
+    query,
+    AssistantMessage,
+    ClaudeAgentOptions,
+    ResultMessage,
+    SystemMessage,
+    TextBlock,
+    ThinkingBlock,
+    ToolUseBlock,
+)
 from loguru import logger
 
+from tinabot._util import is_async_callable
 from tinabot.config import AgentConfig
 from tinabot.memory import Task, TaskMemory
+from tinabot.response_cache import READ_ONLY_TOOLS, ResponseCache
 from tinabot.skills import SkillsLoader
 
 # Callback types for streaming output
@@ -20,6 +36,86 @@ OnThinking = Callable[[str], Awaitable[None] | None]
 OnTool = Callable[[str, dict[str, Any]], Awaitable[None] | None]
 
 
+class _Coalescer:
+    """Buffer streamed text chunks and deliver them to a callback in batches.
+
+    A batch is flushed once it reaches ``max_chars``, ``max_ms`` after its
+    first chunk arrived, or on ``close()``. Callback order is preserved.
+    """
+
+    def __init__(
+        self,
+        callback: Callable[[str], Awaitable[None] | None],
+        max_chars: int = 512,
+        max_ms: int = 50,
+    ):
+        self._callback = callback
+        self._is_async = is_async_callable(callback)
+        self._max_chars = max_chars
+        self._delay = max_ms / 1000
+        self._buf: list[str] = []
+        self._size = 0
+        self._timer: asyncio.TimerHandle | None = None
+        self._inflight: asyncio.Future | None = None
+
+    async def push(self, text: str):
+        self._buf.append(text)
+        self._size += len(text)
+        if self._size >= self._max_chars:
+            await self.flush()
+        elif self._timer is None:
+            self._timer = asyncio.get_running_loop().call_later(
+                self._delay, self._on_timer
+            )
+
+    def _take(self) -> str:
+        chunk = "".join(self._buf)
+        self._buf.clear()
+        self._size = 0
+        return chunk
+
+    def _on_timer(self):
+        self._timer = None
+        if not self._buf or self._inflight is not None:
+            return
+        result = self._callback(self._take())
+        if self._is_async:
+            self._inflight = asyncio.ensure_future(result)
+
+    async def flush(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        # Let a timer-triggered delivery finish first so chunks stay ordered
+        if self._inflight is not None:
+            inflight, self._inflight = self._inflight, None
+            await inflight
+        if not self._buf:
+            return
+        result = self._callback(self._take())
+        if self._is_async:
+            await result
+
+    async def close(self):
+        """Deliver anything still buffered."""
+        try:
+            await self.flush()
+        except Exception as e:
+            logger.warning(f"Streaming callback failed: {e}")
+
+    def ordered_before(self, on_tool: OnTool) -> OnTool:
+        """Wrap a tool callback so buffered text is delivered before it runs."""
+        tool_async = is_async_callable(on_tool)
+
+        async def _on_tool(name: str, input_data: dict[str, Any]):
+            await self.flush()
+            result = on_tool(name, input_data)
+            if tool_async:
+                await result
+
+        return _on_tool
+
+
 IDENTITY_PROMPT_BASE = """\
 You are Tina, a capable AI agent running on the user's local machine. \
 You have direct access to tools and MUST use them proactively to accomplish tasks. \
@@ -119,8 +215,62 @@ Summarize our conversation so far, capturing:
 
 Be concise but preserve all important context needed to continue this work."""
 
+# Tasks whose <previous-context> block is kept, least recently used dropped first
+_MAX_CTX_CACHE = 64
+
+# Shared env for CLI subprocesses when no API key is configured (never mutated)
+_EMPTY_ENV: dict[str, str] = {}
+
 
-@dataclass
+def _cli_env(api_key: str | None) -> dict[str, str]:
+    """Env overrides for the Claude CLI subprocess."""
+    return {"ANTHROPIC_API_KEY": api_key} if api_key else _EMPTY_ENV
+
+
+# Template split around its {chat_id} placeholders, with {{ }} escapes resolved
+_SCHED_PARTS: tuple[str, ...] = tuple(
+    part.replace("{{", "{").replace("}}", "}")
+    for part in SCHEDULING_PROMPT_TEMPLATE.split("{chat_id}")
+)
+
+
+@functools.lru_cache(maxsize=128)
+def _render_sched(chat_id: int) -> str:
+    """Render the scheduling prompt for a chat (memoized per chat_id)."""
+    return str(chat_id).join(_SCHED_PARTS)
+
+
+@functools.lru_cache(maxsize=64)
+def _assemble_prompt(prefix: str, chat_id: int | None, context: str) -> str:
+    """Join system prompt parts; identical inputs return the same str object."""
+    parts = [prefix]
+    # Add scheduling instructions when chat_id is available
+    if chat_id is not None:
+        parts.append(_render_sched(chat_id))
+    if context:
+        parts.append(context)
+    return "\n\n".join(parts)
+
+
+class _OneShotAsyncIter:
+    """Async iterator that yields a single prepared item."""
+
+    __slots__ = ("_item",)
+
+    def __init__(self, item: Any):
+        self._item = item
+
+    def __aiter__(self) -> _OneShotAsyncIter:
+        return self
+
+    async def __anext__(self) -> Any:
+        if self._item is None:
+            raise StopAsyncIteration
+        item, self._item = self._item, None
+        return item
+
+
+@dataclass(slots=True)
 class ImageInput:
     """An image to include in a message to the agent."""
 
@@ -128,42 +278,63 @@ class ImageInput:
     media_type: str  # e.g. "image/jpeg", "image/png"
 
 
-MODEL_PRICING: dict[str, tuple[float, float]] = {
-    # model_prefix -> (input_$/MTok, output_$/MTok)
-    "claude-opus-4": (5.0, 25.0),
-    "claude-sonnet-4": (3.0, 15.0),
-    "claude-haiku-4": (1.0, 5.0),
-}
+class _ModelInfo(NamedTuple):
+    provider: str
+    in_price: float  # input $/MTok
+    out_price: float  # output $/MTok
 
-MODEL_PRICING_OPENAI: dict[str, tuple[float, float]] = {
-    # model -> (input_$/MTok, output_$/MTok)
-    "gpt-4o": (2.5, 10.0),
-    "gpt-4o-mini": (0.15, 0.6),
-    "gpt-4.1": (2.0, 8.0),
-    "gpt-5.2": (0.0, 0.0),
-    "o3": (2.0, 8.0),
-    "o4-mini": (1.1, 4.4),
-}
 
 # Unified model registry: model -> (provider, input_$/MTok, output_$/MTok)
-KNOWN_MODELS: dict[str, tuple[str, float, float]] = {
+_MODELS: Mapping[str, _ModelInfo] = MappingProxyType({
     # Claude
-    "claude-opus-4-6": ("claude", 5.0, 25.0),
-    "claude-sonnet-4-5-20250929": ("claude", 3.0, 15.0),
-    "claude-haiku-4-5-20251001": ("claude", 1.0, 5.0),
+    "claude-opus-4-6": _ModelInfo("claude", 5.0, 25.0),
+    "claude-sonnet-4-5-20250929": _ModelInfo("claude", 3.0, 15.0),
+    "claude-haiku-4-5-20251001": _ModelInfo("claude", 1.0, 5.0),
     # OpenAI
-    "gpt-4o": ("openai", 2.5, 10.0),
-    "gpt-4o-mini": ("openai", 0.15, 0.6),
-    "gpt-4.1": ("openai", 2.0, 8.0),
-    "gpt-5.2": ("openai", 0.0, 0.0),
-    "o3": ("openai", 2.0, 8.0),
-    "o4-mini": ("openai", 1.1, 4.4),
+    "gpt-4o": _ModelInfo("openai", 2.5, 10.0),
+    "gpt-4o-mini": _ModelInfo("openai", 0.15, 0.6),
+    "gpt-4.1": _ModelInfo("openai", 2.0, 8.0),
+    "gpt-5.2": _ModelInfo("openai", 0.0, 0.0),
+    "o3": _ModelInfo("openai", 2.0, 8.0),
+    "o4-mini": _ModelInfo("openai", 1.1, 4.4),
+})
+
+# Model-family prefixes, used to price versions not listed above
+_FAMILIES: dict[str, _ModelInfo] = {
+    "claude-opus-4": _ModelInfo("claude", 5.0, 25.0),
+    "claude-sonnet-4": _ModelInfo("claude", 3.0, 15.0),
+    "claude-haiku-4": _ModelInfo("claude", 1.0, 5.0),
 }
 
+# Prefix fallback, longest first so e.g. "gpt-4o-mini" wins over "gpt-4o"
+_PREFIX_INDEX: tuple[tuple[str, _ModelInfo], ...] = tuple(
+    sorted({**_FAMILIES, **_MODELS}.items(), key=lambda kv: -len(kv[0]))
+)
+
 
-def get_known_models() -> dict[str, tuple[str, float, float]]:
-    """Return the known models registry."""
-    return KNOWN_MODELS
+def _lookup_model(model: str) -> _ModelInfo | None:
+    """Find registry info by exact name, then by longest matching prefix."""
+    info = _MODELS.get(model)
+    if info is not None:
+        return info
+    for prefix, info in _PREFIX_INDEX:
+        if model.startswith(prefix):
+            return info
+    return None
+
+
+def _resolve_pricing(model: str, is_claude: bool) -> tuple[float, float]:
+    """Resolve (input_$/MTok, output_$/MTok) for a model."""
+    info = _lookup_model(model)
+    if info is not None:
+        return info.in_price, info.out_price
+    # Default to Opus pricing for Claude, gpt-4o pricing otherwise
+    return (5.0, 25.0) if is_claude else (2.5, 10.0)
+
+
+def get_known_models() -> Mapping[str, _ModelInfo]:
+    """Return the known models registry (read-only)."""
+    return _MODELS
 
 
 def infer_provider(model: str) -> str | None:
@@ -173,8 +344,9 @@ def infer_provider(model: str) -> str | None:
     providers (DeepSeek, Mistral, local LLMs, etc.) should use provider="openai"
     with a custom base_url in config.
     """
-    if model in KNOWN_MODELS:
-        return KNOWN_MODELS[model][0]
+    info = _lookup_model(model)
+    if info is not None:
+        return info.provider
     # Fallback heuristics
     if model.startswith("claude-"):
         return "claude"
@@ -184,7 +356,7 @@ def infer_provider(model: str) -> str | None:
     return "openai"
 
 
-@dataclass
+@dataclass(slots=True)
 class AgentResponse:
     """Response from an agent interaction."""
 
@@ -197,7 +369,183 @@ class AgentResponse:
     cache_creation_tokens: int = 0
     thinking: str = ""
     num_turns: int = 0
-    tool_uses: list[str] = field(default_factory=list)
+    tool_uses: list[str] = field(default_factory=list)  # unique, in first-use order
+    tool_use_counts: Counter[str] = field(default_factory=Counter)
+
+
+class _ClaudeStream:
+    """Per-call state for one Claude query stream.
+
+    Messages and content blocks are routed through type-keyed handler tables
+    (_MSG_HANDLERS / _BLOCK_HANDLERS) instead of an isinstance chain.
+    """
+
+    __slots__ = (
+        "agent",
+        "task",
+        "response",
+        "text_buf",
+        "thinking_buf",
+        "text_cb",
+        "thinking_cb",
+        "on_tool",
+        "on_tool_async",
+    )
+
+    def __init__(
+        self,
+        agent: TinaAgent,
+        task: Task,
+        on_text: OnText | None,
+        on_thinking: OnThinking | None,
+        on_tool: OnTool | None,
+    ):
+        self.agent = agent
+        self.task = task
+        self.response = AgentResponse()
+        self.text_buf = io.StringIO()
+        self.thinking_buf = io.StringIO()
+        # Coalesce chunked callbacks to cut per-block awaits
+        self.text_cb = _Coalescer(on_text) if on_text else None
+        self.thinking_cb = _Coalescer(on_thinking) if on_thinking else None
+        self.on_tool_async = is_async_callable(on_tool)
+        if on_tool is not None and not self.on_tool_async:
+            # Sync tool callbacks run in a worker thread so formatting large
+            # tool inputs doesn't stall the event loop
+            on_tool = functools.partial(asyncio.to_thread, on_tool)
+            self.on_tool_async = True
+        self.on_tool = on_tool
+
+    def append_text(self, text: str):
+        if self.text_buf.tell():
+            self.text_buf.write("\n")
+        self.text_buf.write(text)
+
+    async def handle(self, msg: Any):
+        cls = type(msg)
+        handler = _MSG_HANDLERS.get(cls)
+        if handler is None:
+            handler = _resolve_handler(_MSG_HANDLERS, cls)
+        await handler(self, msg)
+
+    async def close(self) -> AgentResponse:
+        """Flush callbacks and finalize the accumulated response."""
+        if self.text_cb:
+            await self.text_cb.close()
+        if self.thinking_cb:
+            await self.thinking_cb.close()
+        self.response.text = self.text_buf.getvalue()
+        self.response.thinking = self.thinking_buf.getvalue()
+        return self.response
+
+    async def _ignore(self, item: Any):
+        """Handler for message/block types the agent doesn't act on."""
+
+    async def _on_system(self, msg: SystemMessage):
+        if msg.subtype == "init":
+            session_id = msg.data.get("session_id")
+            if session_id:
+                self.response.session_id = session_id
+                self.agent.memory.update_session_id(self.task.id, session_id)
+                logger.debug(
+                    "Session init: task={} session={}", self.task.id, session_id
+                )
+
+    async def _on_assistant(self, msg: AssistantMessage):
+        lookup = _BLOCK_HANDLERS.get
+        for block in msg.content:
+            cls = type(block)
+            handler = lookup(cls)
+            if handler is None:
+                handler = _resolve_handler(_BLOCK_HANDLERS, cls)
+            await handler(self, block)
+
+    async def _on_result(self, msg: ResultMessage):
+        response = self.response
+        response.session_id = msg.session_id
+        response.cost_usd = msg.total_cost_usd
+        response.num_turns = msg.num_turns
+        usage = msg.usage
+        if usage:
+            logger.debug("Usage: {}", usage)
+            response.input_tokens = usage.get("input_tokens", 0)
+            response.output_tokens = usage.get("output_tokens", 0)
+            response.cache_read_tokens = usage.get("cache_read_input_tokens", 0)
+            response.cache_creation_tokens = usage.get(
+                "cache_creation_input_tokens", 0
+            )
+            logger.debug(
+                "Prompt cache: read={} write={} uncached={}",
+                response.cache_read_tokens,
+                response.cache_creation_tokens,
+                response.input_tokens,
+            )
+        if response.cost_usd is None and (
+            response.input_tokens or response.output_tokens
+        ):
+            response.cost_usd = self.agent._estimate_cost(response)
+        self.agent.memory.update_session_id(self.task.id, msg.session_id)
+
+    async def _on_text_block(self, block: TextBlock):
+        text = block.text
+        buf = self.text_buf
+        if buf.tell():
+            # Same separator for the callback as for response.text, so live
+            # output matches the final (and cached) text
+            text = "\n" + text
+        buf.write(text)
+        if self.text_cb:
+            await self.text_cb.push(text)
+
+    async def _on_thinking_block(self, block: ThinkingBlock):
+        self.thinking_buf.write(block.thinking)
+        if self.thinking_cb:
+            await self.thinking_cb.push(block.thinking)
+
+    async def _on_tool_block(self, block: ToolUseBlock):
+        counts = self.response.tool_use_counts
+        if block.name not in counts:
+            self.response.tool_uses.append(block.name)
+        counts[block.name] += 1
+        # Deliver buffered chunks before the tool event
+        if self.thinking_cb:
+            await self.thinking_cb.flush()
+        if self.text_cb:
+            await self.text_cb.flush()
+        if self.on_tool:
+            result = self.on_tool(block.name, block.input)
+            if self.on_tool_async:
+                await result
+
+
+_MSG_HANDLERS: dict[type, Callable[[_ClaudeStream, Any], Awaitable[None]]] = {
+    SystemMessage: _ClaudeStream._on_system,
+    AssistantMessage: _ClaudeStream._on_assistant,
+    ResultMessage: _ClaudeStream._on_result,
+}
+
+_BLOCK_HANDLERS: dict[type, Callable[[_ClaudeStream, Any], Awaitable[None]]] = {
+    TextBlock: _ClaudeStream._on_text_block,
+    ThinkingBlock: _ClaudeStream._on_thinking_block,
+    ToolUseBlock: _ClaudeStream._on_tool_block,
+}
+
+
+def _resolve_handler(
+    table: dict[type, Callable[[_ClaudeStream, Any], Awaitable[None]]], cls: type
+) -> Callable[[_ClaudeStream, Any], Awaitable[None]]:
+    """Find the handler for a type not in ``table`` and memoize the result.
+
+    Subclasses map to their base's handler; unrelated types (e.g. UserMessage
+    tool results) map to a no-op so later lookups are a single dict hit.
+    """
+    for base, handler in list(table.items()):
+        if issubclass(cls, base):
+            break
+    else:
+        handler = _ClaudeStream._ignore
+    table[cls] = handler
+    return handler
 
 
 class TinaAgent:
@@ -215,48 +563,75 @@ class TinaAgent:
     - Message history stored per-task via MessageStore
     """
 
+    __slots__ = (
+        "config",
+        "skills",
+        "memory",
+        "_prompt_prefix",
+        "_ctx_cache",
+        "_merged_tools",
+        "_base_options",
+        "_in_price",
+        "_out_price",
+        "_cache_read_price",
+        "_cache_write_price",
+        "_cwd",
+        "_cwd_str",
+        "_cwd_src",
+        "_env",
+        "_pending_writes",
+        "_last_resp_writes",
+        "_compressions",
+        "_openai_agent",
+        "_message_store",
+        "_openai_auth",
+        "_openai_auth_mtime",
+        "_use_codex",
+        "_response_cache",
+    )
+
     def __init__(
         self,
         config: AgentConfig,
         skills_loader: SkillsLoader,
         task_memory: TaskMemory,
+        response_cache: ResponseCache | None = None,
     ):
         self.config = config
         self.skills = skills_loader
         self.memory = task_memory
+        self._response_cache = response_cache
+
+        # Cached system prompt pieces (see _build_system_prompt)
+        self._prompt_prefix = ""
+        self._ctx_cache: OrderedDict[str, tuple[str, str | None, str | None]] = (
+            OrderedDict()
+        )
+        self._refresh_prompt_prefix()
+        self.skills.on_reload(self._refresh_prompt_prefix)
+        self.memory.on_delete(self._forget_context)
+        self._bind_pricing()
+        # Pass API key to CLI subprocess if configured
+        self._env = _cli_env(config.api_key)
+        self._cwd_src: str | None = None
+        self._bind_cwd()
+
+        # Background persistence started by process(), see aclose()
+        self._pending_writes: set[asyncio.Task] = set()
+        # Latest last-response write per task, awaited before it is read back
+        self._last_resp_writes: dict[str, asyncio.Task] = {}
+        # In-flight compressions by task id, see force_compress()
+        self._compressions: dict[str, asyncio.Task] = {}
 
         # Lazy-init for non-Claude providers
         self._openai_agent = None
         self._message_store = None
         self._openai_auth = None  # OAuth for ChatGPT backend
+        self._openai_auth_mtime: float | None = None
         self._use_codex = False   # True when using OAuth Responses API
 
         if not config.is_claude:
-            from tinabot.message_store import MessageStore
-            from tinabot.openai_agent import OpenAIAgent
-
-            self._message_store = MessageStore(
-                Path(self.memory.data_dir)
-            )
-
-            if config.provider == "openai" and not config.api_key:
-                # No API key — try OAuth tokens
-                from tinabot.openai_auth import OpenAIAuth
-
-                self._openai_auth = OpenAIAuth()
-                if self._openai_auth.is_logged_in:
-                    self._use_codex = True
-                    self._openai_agent = OpenAIAgent(
-                        config, self._message_store, auth=self._openai_auth
-                    )
-                else:
-                    logger.warning(
-                        "OpenAI provider with no api_key and no OAuth tokens. "
-                        "Run: tina login openai"
-                    )
-                    self._openai_agent = OpenAIAgent(config, self._message_store)
-            else:
-                self._openai_agent = OpenAIAgent(config, self._message_store)
+            self._init_openai_backend()
 
     def reinit(self, config: AgentConfig):
         """Reinitialize agent with new config (e.g. after model switch).
@@ -266,7 +641,7 @@ class TinaAgent:
         """
         # Clear old message history before switching
         if self._message_store:
-            from tinabot.message_store import MessageStore
+            self._message_store.close()
             # Clear all cached task histories
             for task in self.memory.list_tasks():
                 self._message_store.clear(task.id)
@@ -275,166 +650,282 @@ class TinaAgent:
         self.config = config
         self._openai_agent = None
         self._message_store = None
-        self._openai_auth = None
         self._use_codex = False
+        self._refresh_prompt_prefix()
+        self._bind_pricing()
+        # Pass API key to CLI subprocess if configured
+        self._env = _cli_env(config.api_key)
+        self._bind_cwd()
 
         if not config.is_claude:
-            from tinabot.message_store import MessageStore
-            from tinabot.openai_agent import OpenAIAgent
+            self._init_openai_backend()
 
-            self._message_store = MessageStore(
-                Path(self.memory.data_dir)
-            )
+    def _init_openai_backend(self):
+        """Set up MessageStore, OAuth and OpenAIAgent for non-Claude providers.
 
-            if config.provider == "openai" and not config.api_key:
-                from tinabot.openai_auth import OpenAIAuth
+        The OpenAIAuth instance is kept across reinit() calls; its token file
+        is only re-read when it changed on disk.
+        """
+        from tinabot.message_store import MessageStore
+        from tinabot.openai_agent import OpenAIAgent
 
-                self._openai_auth = OpenAIAuth()
-                if self._openai_auth.is_logged_in:
-                    self._use_codex = True
-                    self._openai_agent = OpenAIAgent(
-                        config, self._message_store, auth=self._openai_auth
-                    )
-                else:
-                    logger.warning(
-                        "OpenAI provider with no api_key and no OAuth tokens. "
-                        "Run: tina login openai"
-                    )
-                    self._openai_agent = OpenAIAgent(config, self._message_store)
+        config = self.config
+        self._message_store = MessageStore(
+            Path(self.memory.data_dir)
+        )
+
+        if config.provider == "openai" and not config.api_key:
+            # No API key — try OAuth tokens
+            self._refresh_openai_auth()
+            if self._openai_auth.is_logged_in:
+                self._use_codex = True
+                self._openai_agent = OpenAIAgent(
+                    config,
+                    self._message_store,
+                    auth=self._openai_auth,
+                    cwd=self._cwd_str,
+                )
             else:
-                self._openai_agent = OpenAIAgent(config, self._message_store)
+                logger.warning(
+                    "OpenAI provider with no api_key and no OAuth tokens. "
+                    "Run: tina login openai"
+                )
+                self._openai_agent = OpenAIAgent(
+                    config, self._message_store, cwd=self._cwd_str
+                )
+        else:
+            self._openai_agent = OpenAIAgent(
+                config, self._message_store, cwd=self._cwd_str
+            )
 
-    def _build_system_prompt(
-        self, task: Task, chat_id: int | None = None
-    ) -> str:
-        """Build the full system prompt with identity, skills, and task context."""
-        identity = IDENTITY_PROMPT if self.config.is_claude else IDENTITY_PROMPT_OPENAI
-        parts = [identity]
+    def _refresh_openai_auth(self):
+        """Create or reload OpenAIAuth, skipping the reload if tokens are unchanged."""
+        from tinabot.openai_auth import TOKEN_FILE, OpenAIAuth
 
-        # Add skills section
+        try:
+            mtime: float | None = TOKEN_FILE.stat().st_mtime
+        except OSError:
+            mtime = None
+
+        if self._openai_auth is None or mtime != self._openai_auth_mtime:
+            self._openai_auth = OpenAIAuth()
+        self._openai_auth_mtime = mtime
+
+    def _refresh_prompt_prefix(self):
+        """Rebuild the cached system prompt prefix and merged tool list."""
+        self._base_options: ClaudeAgentOptions | None = None
+        # Merge skill-provided tools with config tools (order-preserving dedup)
+        self._merged_tools: tuple[str, ...] = tuple(dict.fromkeys(
+            [*self.config.allowed_tools, *self.skills.get_all_allowed_tools()]
+        ))
+
+        identity = IDENTITY_PROMPT if self.config.is_claude else IDENTITY_PROMPT_OPENAI
         skills_section = self.skills.build_system_prompt_section()
         if skills_section:
-            parts.append(skills_section)
+            self._prompt_prefix = identity + "\n\n" + skills_section
+        else:
+            self._prompt_prefix = identity
 
-        # Add scheduling instructions when chat_id is available
-        if chat_id is not None:
-            parts.append(SCHEDULING_PROMPT_TEMPLATE.format(chat_id=chat_id))
+    def _bind_pricing(self):
+        """Bind per-MTok prices for the configured model (fixed until reinit)."""
+        in_price, out_price = _resolve_pricing(
+            self.config.model, self.config.is_claude
+        )
+        self._in_price = in_price
+        self._out_price = out_price
+        # cache reads are 10% of input price, cache writes are 125%
+        self._cache_read_price = in_price * 0.1
+        self._cache_write_price = in_price * 1.25
 
-        # When session can't be resumed (compressed or lost), inject context
-        if not (task.session_id and task.summary is None):
-            context_parts: list[str] = []
+    def _spawn(self, coro: Awaitable[Any]) -> asyncio.Task:
+        """Run a persistence coroutine in the background, tracked for aclose()."""
+        t = asyncio.ensure_future(coro)
+        self._pending_writes.add(t)
+        t.add_done_callback(self._pending_writes.discard)
+        return t
 
-            summary = self.memory.get_summary(task.id)
-            if summary:
-                context_parts.append(
-                    "## Conversation Summary\n" + summary
-                )
+    def _persist_turn(self, task: Task, text: str):
+        """Save the last response and bump the turn count off the critical path.
 
-            last_resp = self.memory.get_last_response(task.id)
-            if last_resp:
-                context_parts.append(
-                    "## Your Last Response (for reference)\n" + last_resp
-                )
+        The response file is written in a worker thread. TaskMemory batches
+        the tasks.json writes caused by turn increments.
+        """
+        # Save last response as safety net (survives session loss / compression)
+        if text:
+            writes = self._last_resp_writes
+            t = self._spawn(
+                self._save_last_response(task.id, text, writes.get(task.id))
+            )
+            writes[task.id] = t
 
-            if context_parts:
-                parts.append(
-                    "<previous-context>\n"
-                    "This is a continuation of a previous conversation. "
-                    "The session history is not available, but here is "
-                    "what we know:\n\n"
-                    + "\n\n".join(context_parts)
-                    + "\n</previous-context>"
-                )
+            def _done(done: asyncio.Task, task_id: str = task.id):
+                if writes.get(task_id) is done:
+                    del writes[task_id]
 
-        return "\n\n".join(parts)
+            t.add_done_callback(_done)
+        self.memory.increment_turns(task.id)
 
-    def _build_options(
+    async def _save_last_response(
+        self, task_id: str, text: str, previous: asyncio.Task | None
+    ):
+        # Writes for one task land in order
+        if previous is not None:
+            await asyncio.gather(previous, return_exceptions=True)
+        await asyncio.to_thread(self.memory.save_last_response, task_id, text)
+
+    async def aclose(self):
+        """Wait for background persistence started by process() to finish."""
+        while self._pending_writes:
+            await asyncio.gather(*self._pending_writes, return_exceptions=True)
+        self.memory.close()
+        if self._message_store:
+            self._message_store.close()
+
+    def _bind_cwd(self):
+        """Resolve and create the working directory once per configured path."""
+        if self._cwd_src == self.config.cwd:
+            return
+        self._cwd = Path(self.config.cwd).expanduser()
+        self._cwd.mkdir(parents=True, exist_ok=True)
+        self._cwd_str = str(self._cwd)
+        self._cwd_src = self.config.cwd
+
+    def _build_context_block(
+        self, task: Task, summary: str | None, last_resp: str | None
+    ) -> str:
+        """Build the <previous-context> block, reusing it if inputs are unchanged."""
+        cache = self._ctx_cache
+        cached = cache.get(task.id)
+        if cached and cached[1] == summary and cached[2] == last_resp:
+            cache.move_to_end(task.id)
+            return cached[0]
+
+        context_parts: list[str] = []
+        if summary:
+            context_parts.append(
+                "## Conversation Summary\n" + summary
+            )
+        if last_resp:
+            context_parts.append(
+                "## Your Last Response (for reference)\n" + last_resp
+            )
+
+        block = ""
+        if context_parts:
+            block = (
+                "<previous-context>\n"
+                "This is a continuation of a previous conversation. "
+                "The session history is not available, but here is "
+                "what we know:\n\n"
+                + "\n\n".join(context_parts)
+                + "\n</previous-context>"
+            )
+        cache[task.id] = (block, summary, last_resp)
+        cache.move_to_end(task.id)
+        if len(cache) > _MAX_CTX_CACHE:
+            cache.popitem(last=False)
+        return block
+
+    def _forget_context(self, task_id: str):
+        """Drop the cached context block of a deleted or compressed task."""
+        self._ctx_cache.pop(task_id, None)
+
+    async def _build_system_prompt(
+        self, task: Task, chat_id: int | None = None
+    ) -> str:
+        """Build the full system prompt with identity, skills, and task context.
+
+        The static parts (identity, skills, per-chat scheduling) come first and
+        are byte-identical across turns so the CLI's prompt cache can reuse
+        them; the volatile <previous-context> block is always last.
+        """
+        # When session can't be resumed (compressed or lost), inject context
+        context = ""
+        if not (task.session_id and task.summary is None):
+            # The previous turn's response may still be being written
+            pending = self._last_resp_writes.get(task.id)
+            if pending is not None:
+                await asyncio.gather(pending, return_exceptions=True)
+            # Summary and last-response are separate files; read them
+            # concurrently and off the event loop
+            summary, last_resp = await asyncio.gather(
+                asyncio.to_thread(self.memory.get_summary, task.id),
+                asyncio.to_thread(self.memory.get_last_response, task.id),
+            )
+            context = self._build_context_block(task, summary, last_resp)
+
+        return _assemble_prompt(self._prompt_prefix, chat_id, context)
+
+    async def _build_options(
         self,
         task: Task,
         chat_id: int | None = None,
         no_thinking: bool = False,
     ):
         """Build SDK options for a Claude query."""
-        from claude_agent_sdk import ClaudeAgentOptions
-        # Merge skill-provided tools with config tools
-        all_tools = list(self.config.allowed_tools)
-        skill_tools = self.skills.get_all_allowed_tools()
-        for tool in skill_tools:
-            if tool not in all_tools:
-                all_tools.append(tool)
-
-        system_prompt = self._build_system_prompt(task, chat_id=chat_id)
+        system_prompt = await self._build_system_prompt(task, chat_id=chat_id)
 
         # Determine resume behavior
         resume = None
         if task.session_id and task.summary is None:
             resume = task.session_id
 
-        # Pass API key to CLI subprocess if configured
-        env = {}
-        if self.config.api_key:
-            env["ANTHROPIC_API_KEY"] = self.config.api_key
-
-        cwd = Path(self.config.cwd).expanduser()
-        cwd.mkdir(parents=True, exist_ok=True)
-
         thinking_tokens = 0 if no_thinking else self.config.max_thinking_tokens
 
-        return ClaudeAgentOptions(
-            model=self.config.model,
+        # Fields that are fixed per config live on a shared base; each turn
+        # gets a shallow copy so concurrent queries never see each other's
+        # prompt or resume id.
+        base = self._base_options
+        if base is None:
+            base = self._base_options = ClaudeAgentOptions(
+                model=self.config.model,
+                allowed_tools=self._merged_tools,
+                permission_mode=self.config.permission_mode,
+                cwd=self._cwd_str,
+                env=self._env,
+            )
+
+        return replace(
+            base,
             max_thinking_tokens=thinking_tokens,
             system_prompt=system_prompt,
-            allowed_tools=all_tools,
-            permission_mode=self.config.permission_mode,
-            cwd=str(cwd),
             resume=resume,
-            env=env,
         )
 
     def _estimate_cost(self, response: AgentResponse) -> float:
         """Estimate cost from token counts using known model pricing."""
-        in_price, out_price = 5.0, 25.0  # default to Opus pricing
-        for prefix, (ip, op) in MODEL_PRICING.items():
-            if self.config.model.startswith(prefix):
-                in_price, out_price = ip, op
-                break
-        # cache reads are 10% of input price, cache writes are 125%
-        cost = (
-            response.input_tokens * in_price
-            + response.cache_read_tokens * in_price * 0.1
-            + response.cache_creation_tokens * in_price * 1.25
-            + response.output_tokens * out_price
-        ) / 1_000_000
-        return cost
+        return (
+            response.input_tokens * self._in_price
+            + response.cache_read_tokens * self._cache_read_price
+            + response.cache_creation_tokens * self._cache_write_price
+            + response.output_tokens * self._out_price
+        ) * 1e-6
 
     @staticmethod
     def _make_multimodal_prompt(
         message: str, images: list[ImageInput]
     ) -> AsyncIterator[dict[str, Any]]:
         """Build an AsyncIterable prompt with text + image content blocks."""
-
-        async def _gen() -> AsyncIterator[dict[str, Any]]:
-            content: list[dict[str, Any]] = []
-            for img in images:
-                content.append(
-                    {
-                        "type": "image",
-                        "source": {
-                            "type": "base64",
-                            "media_type": img.media_type,
-                            "data": img.data,
-                        },
-                    }
-                )
-            content.append({"type": "text", "text": message})
-            yield {
-                "type": "user",
-                "session_id": "",
-                "message": {"role": "user", "content": content},
-                "parent_tool_use_id": None,
+        content: list[dict[str, Any]] = [
+            {
+                "type": "image",
+                "source": {
+                    "type": "base64",
+                    "media_type": img.media_type,
+                    "data": img.data,
+                },
             }
-
-        return _gen()
+            for img in images
+        ]
+        content.append({"type": "text", "text": message})
+        user_message = {
+            "type": "user",
+            "session_id": "",
+            "message": {"role": "user", "content": content},
+            "parent_tool_use_id": None,
+        }
+
+        return _OneShotAsyncIter(user_message)
 
     async def process(
         self,
@@ -454,7 +945,9 @@ class TinaAgent:
             task: Task to use. If None, uses active or creates new.
             on_text: Callback for text output chunks.
             on_thinking: Callback for thinking output.
-            on_tool: Callback for tool use events (name, input).
+            on_tool: Callback for tool use events (name, input). For Claude,
+                a sync callback is run in a worker thread and must be
+                thread-safe.
             chat_id: Telegram chat ID (enables scheduling instructions).
             images: Optional list of images to include in the message.
 
@@ -467,6 +960,12 @@ class TinaAgent:
         if task is None:
             task = self.memory.create_task(message[:80])
 
+        # A compression in flight changes the session/summary this turn
+        # should build on, so wait for it rather than racing it
+        pending = self._compressions.get(task.id)
+        if pending is not None:
+            await asyncio.shield(pending)
+
         # Route non-Claude providers to OpenAI agent
         if not self.config.is_claude:
             return await self._process_openai(
@@ -479,130 +978,123 @@ class TinaAgent:
                 images=images,
             )
 
-        options = self._build_options(task, chat_id=chat_id, no_thinking=no_thinking)
+        options = await self._build_options(
+            task, chat_id=chat_id, no_thinking=no_thinking
+        )
         logger.info(
-            f"process task={task.id} session={task.session_id} "
-            f"resume={'yes' if options.resume else 'no'} "
-            f"summary={'yes' if task.summary else 'no'} "
-            f"turns={task.turn_count}"
+            "process task={} session={} resume={} summary={} turns={}",
+            task.id,
+            task.session_id,
+            "yes" if options.resume else "no",
+            "yes" if task.summary else "no",
+            task.turn_count,
         )
-        response = AgentResponse()
-        text_parts: list[str] = []
+        # Serve byte-identical recent requests without calling the model
+        cache_key = None
+        if self._response_cache is not None:
+            cache_key = self._response_key(task, options, message, images)
+            cached = self._response_cache.get(cache_key)
+            if cached is not None:
+                return await self._replay_cached(task, cached, on_text)
+
+        stream = _ClaudeStream(self, task, on_text, on_thinking, on_tool)
+        failed = False
 
         # Build prompt: multimodal if images present, plain string otherwise
         prompt: str | AsyncIterator[dict[str, Any]] = message
         if images:
             prompt = self._make_multimodal_prompt(message, images)
 
-        from claude_agent_sdk import (
-            query,
-            AssistantMessage,
-            SystemMessage,
-            ResultMessage,
-            TextBlock,
-            ThinkingBlock,
-            ToolUseBlock,
-        )
-
         timeout = self.config.timeout_seconds or None
+        handle = stream.handle
         try:
             async with asyncio.timeout(timeout):
                 async for msg in query(prompt=prompt, options=options):
-                    if isinstance(msg, SystemMessage):
-                        if msg.subtype == "init":
-                            session_id = msg.data.get("session_id")
-                            if session_id:
-                                response.session_id = session_id
-                                self.memory.update_session_id(
-                                    task.id, session_id
-                                )
-                                logger.debug(
-                                    f"Session init: task={task.id} "
-                                    f"session={session_id}"
-                                )
-
-                    elif isinstance(msg, AssistantMessage):
-                        for block in msg.content:
-                            if isinstance(block, TextBlock):
-                                text_parts.append(block.text)
-                                if on_text:
-                                    result = on_text(block.text)
-                                    if hasattr(result, "__await__"):
-                                        await result
-
-                            elif isinstance(block, ThinkingBlock):
-                                response.thinking += block.thinking
-                                if on_thinking:
-                                    result = on_thinking(block.thinking)
-                                    if hasattr(result, "__await__"):
-                                        await result
-
-                            elif isinstance(block, ToolUseBlock):
-                                response.tool_uses.append(block.name)
-                                if on_tool:
-                                    result = on_tool(block.name, block.input)
-                                    if hasattr(result, "__await__"):
-                                        await result
-
-                    elif isinstance(msg, ResultMessage):
-                        response.session_id = msg.session_id
-                        response.cost_usd = msg.total_cost_usd
-                        response.num_turns = msg.num_turns
-                        if msg.usage:
-                            logger.debug(f"Usage: {msg.usage}")
-                            response.input_tokens = msg.usage.get(
-                                "input_tokens", 0
-                            )
-                            response.output_tokens = msg.usage.get(
-                                "output_tokens", 0
-                            )
-                            response.cache_read_tokens = msg.usage.get(
-                                "cache_read_input_tokens", 0
-                            )
-                            response.cache_creation_tokens = msg.usage.get(
-                                "cache_creation_input_tokens", 0
-                            )
-                        if response.cost_usd is None and (
-                            response.input_tokens or response.output_tokens
-                        ):
-                            response.cost_usd = self._estimate_cost(response)
-                        self.memory.update_session_id(
-                            task.id, msg.session_id
-                        )
+                    await handle(msg)
 
         except TimeoutError:
             logger.warning(f"Agent timed out after {timeout}s for task {task.id}")
-            text_parts.append(
+            failed = True
+            stream.append_text(
                 f"Request timed out after {timeout}s. "
                 "You can retry or send a simpler request."
             )
         except Exception as e:
             logger.error(f"Agent error: {e}")
-            text_parts.append(f"Error: {e}")
+            failed = True
+            stream.append_text(f"Error: {e}")
+        finally:
+            response = await stream.close()
+
+        if (
+            cache_key is not None
+            and not failed
+            and response.text
+            and READ_ONLY_TOOLS.issuperset(response.tool_use_counts)
+        ):
+            self._response_cache.put(cache_key, response)
 
-        response.text = "\n".join(text_parts) if text_parts else ""
+        # Update turn count (auto-compression disabled — use /compress manually)
+        self._persist_turn(task, response.text)
 
-        # Save last response as safety net (survives session loss / compression)
-        if response.text:
-            self.memory.save_last_response(task.id, response.text)
+        return response
 
-        # Update turn count (auto-compression disabled — use /compress manually)
-        self.memory.increment_turns(task.id)
+    def _response_key(
+        self,
+        task: Task,
+        options: Any,
+        message: str,
+        images: list[ImageInput] | None,
+    ) -> str:
+        """Cache key covering everything that determines a Claude response.
 
+        The turn count is included because a resumed session keeps the same
+        resume id across turns; without it a repeated message ("continue")
+        would replay the previous turn's answer.
+        """
+        image_parts: list[str] = []
+        for img in images or ():
+            image_parts.append(img.media_type)
+            image_parts.append(img.data)
+        return ResponseCache.make_key(
+            self.config.model,
+            options.system_prompt,
+            ",".join(options.allowed_tools),
+            options.resume,
+            str(task.turn_count),
+            message,
+            *image_parts,
+        )
+
+    async def _replay_cached(
+        self, task: Task, cached: AgentResponse, on_text: OnText | None
+    ) -> AgentResponse:
+        """Return a cached response as a fresh, zero-cost AgentResponse."""
+        logger.info("process task={} served from response cache", task.id)
+        response = replace(
+            cached,
+            cost_usd=0.0,
+            input_tokens=0,
+            output_tokens=0,
+            cache_read_tokens=0,
+            cache_creation_tokens=0,
+            num_turns=0,
+            tool_uses=list(cached.tool_uses),
+            tool_use_counts=Counter(cached.tool_use_counts),
+        )
+        if on_text:
+            result = on_text(response.text)
+            if is_async_callable(on_text):
+                await result
+        # The model's session never saw this turn, so it is not counted
         return response
 
     def _estimate_cost_openai(self, response: AgentResponse) -> float:
         """Estimate cost for non-Claude models."""
-        in_price, out_price = 2.5, 10.0  # default to gpt-4o pricing
-        model = self.config.model
-        for name, (ip, op) in MODEL_PRICING_OPENAI.items():
-            if model == name or model.startswith(name):
-                in_price, out_price = ip, op
-                break
         return (
-            response.input_tokens * in_price
-            + response.output_tokens * out_price
-        ) / 1_000_000
+            response.input_tokens * self._in_price
+            + response.output_tokens * self._out_price
+        ) * 1e-6
 
     async def _process_openai(
         self,
@@ -615,17 +1107,26 @@ class TinaAgent:
         images: list[ImageInput] | None = None,
     ) -> AgentResponse:
         """Process a message via OpenAI-compatible provider."""
-        system_prompt = self._build_system_prompt(task, chat_id=chat_id)
+        system_prompt = await self._build_system_prompt(task, chat_id=chat_id)
 
         mode = "codex" if self._use_codex else "api"
         logger.info(
-            f"process_openai task={task.id} mode={mode} "
-            f"provider={self.config.provider} model={self.config.model} "
-            f"turns={task.turn_count}"
+            "process_openai task={} mode={} provider={} model={} turns={}",
+            task.id,
+            mode,
+            self.config.provider,
+            self.config.model,
+            task.turn_count,
         )
 
         response = AgentResponse()
 
+        # Token-level deltas are coalesced into batched on_text calls
+        text_cb = _Coalescer(on_text) if on_text else None
+        on_text_batched = text_cb.push if text_cb else None
+        if text_cb and on_tool:
+            on_tool = text_cb.ordered_before(on_tool)
+
         # Convert ImageInput objects to dicts for the OpenAI agent
         img_dicts = None
         if images:
@@ -643,7 +1144,7 @@ class TinaAgent:
                         task_id=task.id,
                         user_message=message,
                         system_prompt=system_prompt,
-                        on_text=on_text,
+                        on_text=on_text_batched,
                         on_thinking=on_thinking,
                         on_tool=on_tool,
                         images=img_dicts,
@@ -654,7 +1155,7 @@ class TinaAgent:
                         task_id=task.id,
                         user_message=message,
                         system_prompt=system_prompt,
-                        on_text=on_text,
+                        on_text=on_text_batched,
                         on_thinking=on_thinking,
                         on_tool=on_tool,
                         images=img_dicts,
@@ -664,7 +1165,8 @@ class TinaAgent:
             response.input_tokens = result.input_tokens
             response.output_tokens = result.output_tokens
             response.num_turns = result.num_turns
-            response.tool_uses = result.tool_uses
+            response.tool_use_counts = Counter(result.tool_uses)
+            response.tool_uses = list(response.tool_use_counts)
 
             if self._use_codex:
                 # ChatGPT subscription — no per-token cost
@@ -681,37 +1183,22 @@ class TinaAgent:
         except Exception as e:
             logger.error(f"OpenAI agent error: {e}")
             response.text = f"Error: {e}"
+        finally:
+            if text_cb:
+                await text_cb.close()
 
-        # Save last response
-        if response.text:
-            self.memory.save_last_response(task.id, response.text)
-
-        self.memory.increment_turns(task.id)
+        self._persist_turn(task, response.text)
 
         return response
 
     async def _compress_task_claude(self, task: Task):
         """Compress a Claude task by asking the agent (via resumed session) to summarize."""
-        from claude_agent_sdk import (
-            query,
-            ClaudeAgentOptions,
-            AssistantMessage,
-            TextBlock,
-        )
-
         if not task.session_id:
             logger.warning(f"Cannot compress task {task.id}: no session_id")
             return
 
         logger.info(f"Compressing task {task.id} ({task.turn_count} turns)")
 
-        env = {}
-        if self.config.api_key:
-            env["ANTHROPIC_API_KEY"] = self.config.api_key
-
-        cwd = Path(self.config.cwd).expanduser()
-        cwd.mkdir(parents=True, exist_ok=True)
-
         try:
             options = ClaudeAgentOptions(
                 model=self.config.model,
@@ -719,8 +1206,8 @@ class TinaAgent:
                 resume=task.session_id,
                 max_turns=1,
                 permission_mode="plan",
-                cwd=str(cwd),
-                env=env,
+                cwd=self._cwd_str,
+                env=self._env,
             )
 
             summary_parts: list[str] = []
@@ -733,6 +1220,7 @@ class TinaAgent:
             if summary_parts:
                 summary = "\n".join(summary_parts)
                 self.memory.save_summary(task.id, summary)
+                self._forget_context(task.id)
                 logger.info(f"Task {task.id} compressed ({len(summary)} chars)")
             else:
                 logger.warning(f"Compression returned empty for task {task.id}")
@@ -753,6 +1241,7 @@ class TinaAgent:
 
             if result.text:
                 self.memory.save_summary(task.id, result.text)
+                self._forget_context(task.id)
                 # Clear message history since we've summarized
                 self._message_store.clear(task.id)
                 logger.info(f"Task {task.id} compressed ({len(result.text)} chars)")
@@ -763,15 +1252,29 @@ class TinaAgent:
             logger.error(f"Compression failed for task {task.id}: {e}")
 
     async def force_compress(self, task: Task) -> str | None:
-        """Force compress a task regardless of turn count."""
-        if self.config.is_claude:
-            if not task.session_id:
-                return None
-            await self._compress_task_claude(task)
-        else:
-            # Non-Claude: compress if we have message history
-            msgs = self._message_store.get_messages(task.id)
-            if len(msgs) <= 1:  # Only system message or empty
-                return None
-            await self._compress_task_openai(task)
+        """Force compress a task regardless of turn count.
+
+        The summarization runs as a tracked background task: concurrent
+        calls for the same task share it, and process() waits for it
+        before starting the next turn.
+        """
+        pending = self._compressions.get(task.id)
+        if pending is None:
+            if self.config.is_claude:
+                if not task.session_id:
+                    return None
+                coro = self._compress_task_claude(task)
+            else:
+                # Non-Claude: compress if we have message history
+                msgs = self._message_store.get_messages(task.id)
+                if len(msgs) <= 1:  # Only system message or empty
+                    return None
+                coro = self._compress_task_openai(task)
+            pending = self._spawn(coro)
+            self._compressions[task.id] = pending
+            pending.add_done_callback(
+                lambda _t, tid=task.id: self._compressions.pop(tid, None)
+            )
+        # Shielded so a cancelled caller doesn't abort the shared compression
+        await asyncio.shield(pending)
         return self.memory.get_summary(task.id)
@@ -9,6 +9,7 @@ from loguru import logger
 from tinabot.agent import TinaAgent
 from tinabot.config import Config
 from tinabot.memory import TaskMemory
+from tinabot.response_cache import ResponseCache
 from tinabot.scheduler import Scheduler, ScheduleStore
 from tinabot.skills import SkillsLoader
 from tinabot.telegram import TelegramBot
@@ -24,7 +25,12 @@ class TinaApp:
             compress_after_turns=config.memory.compress_after_turns,
         )
         self.skills = SkillsLoader(config.skills.skills_dir)
-        self.agent = TinaAgent(config.agent, self.skills, self.memory)
+        response_cache = None
+        if config.agent.response_cache_ttl > 0:
+            response_cache = ResponseCache(ttl=config.agent.response_cache_ttl)
+        self.agent = TinaAgent(
+            config.agent, self.skills, self.memory, response_cache=response_cache
+        )
         self.schedule_store = ScheduleStore(config.memory.data_dir)
 
     async def run_serve(self):
@@ -32,7 +38,7 @@ class TinaApp:
         bot = TelegramBot(
             self.config.telegram, self.agent, self.memory, self.schedule_store
         )
-        scheduler = Scheduler(self.store, self.agent, bot.send_message)
+        scheduler = Scheduler(self.schedule_store, self.agent, bot.send_message)
         scheduler_task: asyncio.Task | None = None
         logger.info("Starting Telegram serve mode...")
         try:
@@ -49,7 +55,4 @@ class TinaApp:
                 except asyncio.CancelledError:
                     pass
             await bot.stop()
-
-    @property
-    def store(self) -> ScheduleStore:
-        return self.schedule_store
+            await self.agent.aclose()
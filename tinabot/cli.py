@@ -3,22 +3,25 @@
 from __future__ import annotations
 
 import asyncio
+import functools
+import re
 import sys
 from pathlib import Path
+from typing import TYPE_CHECKING, Awaitable, Callable
 
 import typer
 from loguru import logger
-from prompt_toolkit import PromptSession
-from prompt_toolkit.history import FileHistory
-from rich.console import Console
-from rich.markdown import Markdown
-from rich.panel import Panel
+from rich.console import Console, Group, RenderableType
 from rich.text import Text
 
-from tinabot.agent import AgentResponse, get_known_models, infer_provider
-from tinabot.app import TinaApp
-from tinabot.config import Config
-from tinabot.memory import Task
+# The agent stack (claude_agent_sdk, mcp, telegram), pydantic config models,
+# prompt_toolkit and Rich's markdown renderer are imported where used, so
+# `--help` and subcommands like `tina login logout` start without them.
+if TYPE_CHECKING:
+    from tinabot.agent import AgentResponse
+    from tinabot.app import TinaApp
+    from tinabot.config import Config
+    from tinabot.memory import Task
 
 app_cli = typer.Typer(
     name="tina",
@@ -30,41 +33,200 @@ app_cli = typer.Typer(
 console = Console()
 
 
+@functools.lru_cache(maxsize=1)
+def _config() -> Config:
+    """Parsed config, loaded once per process."""
+    from tinabot.config import Config
+
+    return Config.load()
+
+
+@functools.lru_cache(maxsize=1)
+def _app() -> TinaApp:
+    """TinaApp wired from _config(), built once per process."""
+    from tinabot.app import TinaApp
+
+    return TinaApp(_config())
+
+
+def _run_async(coro, max_workers: int | None = None):
+    """Run a coroutine on uvloop when installed, else the default asyncio loop.
+
+    ``max_workers`` sizes the loop's default executor (used by to_thread).
+    """
+    try:
+        import uvloop
+    except ImportError:
+        loop_factory = None
+    else:
+        loop_factory = uvloop.new_event_loop
+    with asyncio.Runner(loop_factory=loop_factory) as runner:
+        if max_workers:
+            from concurrent.futures import ThreadPoolExecutor
+
+            runner.get_loop().set_default_executor(
+                ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="tina")
+            )
+        return runner.run(coro)
+
+
 def _print_thinking(text: str):
     """Print thinking output in dim style."""
     console.print(Text(text, style="dim italic"), end="")
 
 
+# Tool name -> (input key shown after the name, max chars or None)
+_TOOL_DETAIL: dict[str, tuple[str, int | None]] = {
+    "Bash": ("command", 80),
+    "Read": ("file_path", None),
+    "Write": ("file_path", None),
+    "Edit": ("file_path", None),
+    "Glob": ("pattern", None),
+    "Grep": ("pattern", None),
+}
+
+
+def _tool_line(name: str, input_data: dict) -> Text:
+    """Build the one-line tool usage indicator."""
+    spec = _TOOL_DETAIL.get(name)
+    if spec is None:
+        return Text(f"  [{name}]", style="cyan dim")
+    key, limit = spec
+    value = input_data.get(key, "")
+    if limit is not None:
+        value = value[:limit]
+    return Text(f"  [{name}: {value}]", style="cyan dim")
+
+
 def _print_tool(name: str, input_data: dict):
     """Print tool usage indicator."""
-    detail = ""
-    if name == "Bash":
-        detail = f": {input_data.get('command', '')[:80]}"
-    elif name == "Read":
-        detail = f": {input_data.get('file_path', '')}"
-    elif name == "Write":
-        detail = f": {input_data.get('file_path', '')}"
-    elif name == "Edit":
-        detail = f": {input_data.get('file_path', '')}"
-    elif name in ("Glob", "Grep"):
-        detail = f": {input_data.get('pattern', '')}"
-    console.print(Text(f"  [{name}{detail}]", style="cyan dim"))
+    console.print(_tool_line(name, input_data))
+
+
+class _StatusRenderer:
+    """Coalesce per-turn status lines (thinking marker, tool calls).
+
+    Lines are buffered and written with a single console.print once
+    ``delay`` seconds pass or ``max_items`` lines pile up, so bursts of tool
+    calls don't each pay for a Rich render and a tty write.
+    """
+
+    def __init__(self, delay: float = 0.03, max_items: int = 32):
+        self._delay = delay
+        self._max_items = max_items
+        self._buf: list[Text] = []
+        self._timer: asyncio.TimerHandle | None = None
+        self._thinking_started = False
+        # The first batch is preceded by a blank line separating it from the prompt
+        self._printed = False
+
+    def _push(self, line: Text):
+        self._buf.append(line)
+        if len(self._buf) >= self._max_items:
+            self.flush()
+        elif self._timer is None:
+            self._timer = asyncio.get_running_loop().call_later(
+                self._delay, self.flush
+            )
+
+    def on_thinking(self, text: str):
+        if not self._thinking_started:
+            self._thinking_started = True
+            self._push(Text("thinking...", style="dim italic"))
+
+    async def on_tool(self, name: str, input_data: dict):
+        self._push(_tool_line(name, input_data))
+
+    def flush(self):
+        """Write buffered lines now."""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        if self._buf:
+            if not self._printed:
+                self._printed = True
+                self._buf.insert(0, Text(""))
+            console.print(Group(*self._buf))
+            self._buf.clear()
+
+
+class _LivePreview:
+    """Transient live view of a reply while it streams in.
+
+    Only the tail that fits the terminal is shown, and markdown is parsed
+    at Live's refresh rate rather than per chunk. The view is cleared on
+    stop() so _print_response can render the final reply once.
+    """
+
+    def __init__(self, refresh_per_second: int = 8):
+        from rich.live import Live
+
+        self._chunks: list[str] = []
+        self._live = Live(
+            console=console,
+            refresh_per_second=refresh_per_second,
+            transient=True,
+            get_renderable=self._render,
+        )
+
+    def _render(self) -> RenderableType:
+        if not self._chunks:
+            return Text("")
+        from rich.markdown import Markdown
+
+        lines = "".join(self._chunks).splitlines()
+        keep = max(console.height - 4, 5)
+        return Markdown("\n".join(lines[-keep:]))
+
+    def on_text(self, chunk: str):
+        self._chunks.append(chunk)
+
+    def start(self):
+        self._live.start()
+
+    def stop(self):
+        self._live.stop()
 
 
 def _fmt_tokens(n: int) -> str:
-    tk = n / 1000
-    if tk < 0.1:
-        return f"{tk:.2f}k"
-    if tk < 10:
-        return f"{tk:.1f}k"
-    return f"{tk:.0f}k"
+    # 2 decimals below 0.1k, 1 below 10k, none above
+    prec = 2 if n < 100 else 1 if n < 10_000 else 0
+    return f"{n / 1000:.{prec}f}k"
+
+
+# Characters that can change how a single line renders as markdown. Text
+# without them (and without a leading digit/indent, i.e. list or code
+# block) is one plain paragraph, which Text renders identically.
+_MD_CHARS = frozenset("*_`#>[]|\\~<&-+!\n")
+
+
+@functools.lru_cache(maxsize=128)
+def _markdown(text: str) -> RenderableType:
+    """Parse markdown once per distinct text (Markdown is immutable once built).
+
+    Plain one-line replies ("Done.") skip the markdown parser entirely.
+    """
+    first = text[:1]
+    if not (_MD_CHARS.intersection(text) or first.isdigit() or first.isspace()):
+        return Text(text)
+
+    from rich.markdown import Markdown
+
+    return Markdown(text)
 
 
 def _print_response(r: AgentResponse):
-    """Print the agent's response with rich markdown rendering."""
+    """Print the agent's response with rich markdown rendering.
+
+    Body and footer go out as one Group so Rich renders the turn in a
+    single print call.
+    """
+    from rich.align import Align
+
+    parts: list[RenderableType] = []
     if r.text:
-        console.print()
-        console.print(Markdown(r.text))
+        parts.append(Text(""))
+        parts.append(_markdown(r.text))
 
     # Cost footer: ↑5.2k ⚡40k ↓1.1k | $0.0534 | 3 turns
     footer_parts = []
@@ -79,15 +241,17 @@ def _print_response(r: AgentResponse):
     if r.num_turns > 0:
         footer_parts.append(f"{r.num_turns} turn{'s' if r.num_turns != 1 else ''}")
     if footer_parts:
-        console.print(Text(" | ".join(footer_parts), style="dim"), justify="right")
+        parts.append(Align.right(Text(" | ".join(footer_parts), style="dim")))
+    if parts:
+        console.print(Group(*parts))
 
 
-def _print_task_info(task: Task):
-    """Print task summary."""
-    status = "active" if task.active else ""
+def _task_line(task: Task) -> Text:
+    """Build the one-line task summary."""
     compressed = " (compressed)" if task.summary else ""
     session = f" session:{task.session_id[:8]}" if task.session_id else ""
-    console.print(
+    # Plain Text, not markup: "[<id>]" must not be parsed as a style tag
+    return Text(
         f"  [{task.id}] {task.name}"
         f"  turns:{task.turn_count}{compressed}{session}"
         f"  {'*' if task.active else ''}",
@@ -95,199 +259,282 @@ def _print_task_info(task: Task):
     )
 
 
+def _print_tasks(tasks: list[Task], header: str | None = None):
+    """Print a task list (with optional bold header) in one Rich call."""
+    lines: list[RenderableType] = [_task_line(t) for t in tasks]
+    if header:
+        lines.insert(0, Text(header, style="bold"))
+    console.print(Group(*lines))
+
+
+# Fixed REPL panels, built on first use (rich.panel stays a lazy import).
+# Help text is plain Text so "[name]" / "[id]" aren't read as style tags.
+@functools.cache
+def _intro_panel() -> RenderableType:
+    from rich.panel import Panel
+
+    return Panel(
+        "[bold]Tina[/bold] - AI Agent\n"
+        "Type a message to chat. Commands: /new /tasks /model /models /help /exit",
+        border_style="blue",
+    )
+
+
+@functools.cache
+def _help_panel() -> RenderableType:
+    from rich.panel import Panel
+
+    return Panel(
+        Text(
+            "/new [name]     Create a new task\n"
+            "/tasks          List all tasks\n"
+            "/resume <id>    Switch to a task\n"
+            "/compress       Compress current task context\n"
+            "/delete <id>    Delete a task\n"
+            "/export [id]    Export conversation history\n"
+            "/skills         List loaded skills\n"
+            "/models         List available models\n"
+            "/model [name]   Show or switch model\n"
+            "/help           Show this help\n"
+            "/exit           Quit"
+        ),
+        title="Commands",
+        border_style="blue",
+    )
+
+
 async def _run_repl(tina: TinaApp):
     """Run the interactive REPL loop."""
+    from prompt_toolkit import PromptSession
+    from prompt_toolkit.history import ThreadedHistory
+
+    from tinabot.repl_history import BackgroundFileHistory
+
     history_path = str(Path(tina.config.memory.data_dir).expanduser().parent / "history")
+    history = BackgroundFileHistory(history_path)
+    # ThreadedHistory reads the file on a worker thread, so a long history
+    # doesn't hold up the first prompt
     session: PromptSession = PromptSession(
-        history=FileHistory(history_path),
+        history=ThreadedHistory(history),
     )
 
     # Ensure an active task exists
     if not tina.memory.get_active_task():
         tina.memory.create_task("Default task")
 
-    console.print(
-        Panel(
-            "[bold]Tina[/bold] - AI Agent\n"
-            "Type a message to chat. Commands: /new /tasks /model /models /help /exit",
-            border_style="blue",
-        )
-    )
+    console.print(_intro_panel())
 
     task = tina.memory.get_active_task()
     model_info = f"{tina.config.agent.model} ({tina.config.agent.provider})"
     if task:
-        console.print(f"Active task: [{task.id}] {task.name}  Model: {model_info}", style="dim")
+        console.print(
+            Text(f"Active task: [{task.id}] {task.name}  Model: {model_info}", style="dim")
+        )
     else:
         console.print(f"Model: {model_info}", style="dim")
 
-    while True:
-        try:
-            user_input = await session.prompt_async("you> ")
-        except (EOFError, KeyboardInterrupt):
-            console.print("\nBye!", style="dim")
-            break
-
-        user_input = user_input.strip()
-        if not user_input:
-            continue
-
-        # Handle commands
-        if user_input.startswith("/"):
-            handled = await _handle_command(user_input, tina)
-            if handled == "exit":
+    try:
+        while True:
+            try:
+                user_input = await session.prompt_async("you> ")
+            except (EOFError, KeyboardInterrupt):
+                console.print("\nBye!", style="dim")
                 break
-            continue
 
-        # Send to agent
-        task = tina.memory.get_active_task()
-        console.print()
+            user_input = user_input.strip()
+            if not user_input:
+                continue
 
-        thinking_started = False
+            # Handle commands
+            if user_input.startswith("/"):
+                handled = await _handle_command(user_input, tina)
+                if handled == "exit":
+                    break
+                continue
 
-        def on_thinking(text: str):
-            nonlocal thinking_started
-            if not thinking_started:
-                console.print(Text("thinking...", style="dim italic"))
-                thinking_started = True
+            # Send to agent
+            task = tina.memory.get_active_task()
+            status = _StatusRenderer()
+            # Live preview only makes sense on an interactive terminal
+            preview = _LivePreview() if console.is_terminal else None
+            if preview:
+                preview.start()
+            try:
+                response = await tina.agent.process(
+                    message=user_input,
+                    task=task,
+                    on_text=preview.on_text if preview else None,
+                    on_thinking=status.on_thinking,
+                    on_tool=status.on_tool,
+                )
+            finally:
+                status.flush()
+                if preview:
+                    preview.stop()
+
+            _print_response(response)
+    finally:
+        # Flush background persistence before the event loop shuts down,
+        # also when the loop is cancelled or a turn raised
+        history.close()
+        await tina.agent.aclose()
+
+
+async def _cmd_exit(arg: str, tina: TinaApp) -> str | None:
+    console.print("Bye!", style="dim")
+    return "exit"
+
+
+async def _cmd_new(arg: str, tina: TinaApp) -> str | None:
+    name = arg or "New task"
+    task = tina.memory.create_task(name)
+    console.print(Text(f"Created task [{task.id}] {task.name}", style="green"))
+    return None
 
-        response = await tina.agent.process(
-            message=user_input,
-            task=task,
-            on_thinking=on_thinking,
-            on_tool=_print_tool,
-        )
 
-        _print_response(response)
+async def _cmd_tasks(arg: str, tina: TinaApp) -> str | None:
+    tasks = tina.memory.list_tasks()
+    if not tasks:
+        console.print("No tasks.", style="dim")
+    else:
+        _print_tasks(tasks, header="Tasks:")
+    return None
 
 
-async def _handle_command(cmd: str, tina: TinaApp) -> str | None:
-    """Handle a /command. Returns 'exit' to quit."""
-    parts = cmd.split(maxsplit=1)
-    command = parts[0].lower()
-    arg = parts[1].strip() if len(parts) > 1 else ""
-
-    if command == "/exit" or command == "/quit":
-        console.print("Bye!", style="dim")
-        return "exit"
-
-    elif command == "/new":
-        name = arg or "New task"
-        task = tina.memory.create_task(name)
-        console.print(f"Created task [{task.id}] {task.name}", style="green")
-
-    elif command == "/tasks":
-        tasks = tina.memory.list_tasks()
-        if not tasks:
-            console.print("No tasks.", style="dim")
+async def _cmd_resume(arg: str, tina: TinaApp) -> str | None:
+    if not arg:
+        console.print("Usage: /resume <task_id>", style="yellow")
+    else:
+        task = tina.memory.set_active(arg)
+        if task:
+            console.print(Text(f"Resumed task [{task.id}] {task.name}", style="green"))
         else:
-            console.print("Tasks:", style="bold")
-            for t in tasks:
-                _print_task_info(t)
+            console.print(f"Task '{arg}' not found", style="red")
+    return None
+
+
+async def _cmd_compress(arg: str, tina: TinaApp) -> str | None:
+    from rich.panel import Panel
 
-    elif command == "/resume":
-        if not arg:
-            console.print("Usage: /resume <task_id>", style="yellow")
+    task = tina.memory.get_active_task()
+    if not task:
+        console.print("No active task", style="yellow")
+    elif tina.agent.config.is_claude and not task.session_id:
+        console.print("No session to compress", style="yellow")
+    else:
+        console.print("Compressing...", style="dim")
+        summary = await tina.agent.force_compress(task)
+        if summary:
+            console.print(Panel(Text(summary), title="Summary", border_style="blue"))
         else:
-            task = tina.memory.set_active(arg)
-            if task:
-                console.print(f"Resumed task [{task.id}] {task.name}", style="green")
-            else:
-                console.print(f"Task '{arg}' not found", style="red")
+            console.print("Compression failed", style="red")
+    return None
 
-    elif command == "/compress":
-        task = tina.memory.get_active_task()
+
+async def _cmd_delete(arg: str, tina: TinaApp) -> str | None:
+    if not arg:
+        console.print("Usage: /delete <task_id>", style="yellow")
+    else:
+        task = tina.memory.get_task(arg)
         if not task:
-            console.print("No active task", style="yellow")
-        elif tina.agent.config.is_claude and not task.session_id:
-            console.print("No session to compress", style="yellow")
-        else:
-            console.print("Compressing...", style="dim")
-            summary = await tina.agent.force_compress(task)
-            if summary:
-                console.print(Panel(summary, title="Summary", border_style="blue"))
-            else:
-                console.print("Compression failed", style="red")
-
-    elif command == "/delete":
-        if not arg:
-            console.print("Usage: /delete <task_id>", style="yellow")
-        else:
-            task = tina.memory.get_task(arg)
-            if not task:
-                console.print(f"Task '{arg}' not found", style="yellow")
-            else:
-                tina.memory.delete_task(arg)
-                console.print(f"Deleted [{arg}] {task.name}", style="green")
-
-    elif command == "/export":
-        task_id = arg
-        if not task_id:
-            task = tina.memory.get_active_task()
-            if task:
-                task_id = task.id
-        if not task_id:
-            console.print("Usage: /export [task_id]", style="yellow")
-        else:
-            history = tina.memory.export_task_history(task_id)
-            if history:
-                from pathlib import Path
-
-                out = Path(f"task_{task_id}.md")
-                out.write_text(history, encoding="utf-8")
-                console.print(f"Exported to {out}", style="green")
-            else:
-                console.print("No conversation history found", style="yellow")
-
-    elif command == "/skills":
-        skills = tina.skills.list_skills()
-        if not skills:
-            console.print("No skills found.", style="dim")
+            console.print(f"Task '{arg}' not found", style="yellow")
         else:
-            console.print("Skills:", style="bold")
-            for s in skills:
-                console.print(f"  {s['name']}: {s['description']}", style="cyan")
+            tina.memory.delete_task(arg)
+            console.print(Text(f"Deleted [{arg}] {task.name}", style="green"))
+    return None
 
-    elif command == "/models":
-        _print_model_list(tina.config.agent.model, tina.config.agent.provider)
 
-    elif command == "/model":
-        if not arg:
-            console.print(
-                f"Current model: {tina.config.agent.model} ({tina.config.agent.provider})",
-            )
+async def _cmd_export(arg: str, tina: TinaApp) -> str | None:
+    task_id = arg
+    if not task_id:
+        task = tina.memory.get_active_task()
+        if task:
+            task_id = task.id
+    if not task_id:
+        console.print(Text("Usage: /export [task_id]", style="yellow"))
+    else:
+        # Session files can be large; read and write them off the event loop
+        history = await asyncio.to_thread(tina.memory.export_task_history, task_id)
+        if history:
+            out = Path(f"task_{task_id}.md")
+            await asyncio.to_thread(out.write_text, history, encoding="utf-8")
+            console.print(f"Exported to {out}", style="green")
         else:
-            model, provider = _switch_model(arg)
-            # Update in-memory config and reinitialize agent
-            tina.config.agent.model = model
-            tina.config.agent.provider = provider
-            tina.agent.reinit(tina.config.agent)
-            console.print(f"Switched to {model} ({provider})", style="green")
-
-    elif command == "/help":
+            console.print("No conversation history found", style="yellow")
+    return None
+
+
+async def _cmd_skills(arg: str, tina: TinaApp) -> str | None:
+    # Re-scan so newly installed skills reach the agent's system prompt
+    tina.skills.reload()
+    skills = tina.skills.list_skills()
+    if not skills:
+        console.print("No skills found.", style="dim")
+    else:
+        console.print("Skills:", style="bold")
+        for s in skills:
+            console.print(f"  {s['name']}: {s['description']}", style="cyan")
+    return None
+
+
+async def _cmd_models(arg: str, tina: TinaApp) -> str | None:
+    _print_model_list(tina.config.agent.model, tina.config.agent.provider)
+    return None
+
+
+async def _cmd_model(arg: str, tina: TinaApp) -> str | None:
+    if not arg:
         console.print(
-            Panel(
-                "/new [name]     Create a new task\n"
-                "/tasks          List all tasks\n"
-                "/resume <id>    Switch to a task\n"
-                "/compress       Compress current task context\n"
-                "/delete <id>    Delete a task\n"
-                "/export [id]    Export conversation history\n"
-                "/skills         List loaded skills\n"
-                "/models         List available models\n"
-                "/model [name]   Show or switch model\n"
-                "/help           Show this help\n"
-                "/exit           Quit",
-                title="Commands",
-                border_style="blue",
-            )
+            f"Current model: {tina.config.agent.model} ({tina.config.agent.provider})",
         )
     else:
-        console.print(f"Unknown command: {command}. Type /help", style="yellow")
+        # Reads and rewrites config.json; keep the prompt loop responsive
+        model, provider = await asyncio.to_thread(_switch_model, arg)
+        # Update in-memory config and reinitialize agent
+        tina.config.agent.model = model
+        tina.config.agent.provider = provider
+        tina.agent.reinit(tina.config.agent)
+        console.print(f"Switched to {model} ({provider})", style="green")
+    return None
+
 
+async def _cmd_help(arg: str, tina: TinaApp) -> str | None:
+    console.print(_help_panel())
     return None
 
 
+# "/command rest-of-line": command token, then the argument (input is pre-stripped)
+_CMD_RE = re.compile(r"(\S+)\s*(.*)", re.DOTALL)
+
+# REPL /commands; each handler gets (arg, tina) and returns "exit" to quit
+_COMMANDS: dict[str, Callable[[str, TinaApp], Awaitable[str | None]]] = {
+    "/exit": _cmd_exit,
+    "/quit": _cmd_exit,
+    "/new": _cmd_new,
+    "/tasks": _cmd_tasks,
+    "/resume": _cmd_resume,
+    "/compress": _cmd_compress,
+    "/delete": _cmd_delete,
+    "/export": _cmd_export,
+    "/skills": _cmd_skills,
+    "/models": _cmd_models,
+    "/model": _cmd_model,
+    "/help": _cmd_help,
+}
+
+
+async def _handle_command(cmd: str, tina: TinaApp) -> str | None:
+    """Handle a /command. Returns 'exit' to quit."""
+    command, arg = _CMD_RE.match(cmd).groups()
+    command = command.lower()
+
+    handler = _COMMANDS.get(command)
+    if handler is None:
+        console.print(f"Unknown command: {command}. Type /help", style="yellow")
+        return None
+    return await handler(arg, tina)
+
+
 @app_cli.callback(invoke_without_command=True)
 def default_command(ctx: typer.Context):
     """Start interactive chat (default)."""
@@ -298,15 +545,14 @@ def default_command(ctx: typer.Context):
 @app_cli.command()
 def chat():
     """Start interactive REPL."""
-    config = Config.load()
-    tina = TinaApp(config)
-    asyncio.run(_run_repl(tina))
+    tina = _app()
+    _run_async(_run_repl(tina))
 
 
 @app_cli.command()
 def serve():
     """Start Telegram bot."""
-    config = Config.load()
+    config = _config()
     if not config.telegram.token:
         console.print(
             "Set TINABOT_TELEGRAM__TOKEN or configure telegram.token in ~/.tinabot/config.json",
@@ -314,28 +560,55 @@ def serve():
         )
         raise typer.Exit(1)
     config.telegram.enabled = True
-    tina = TinaApp(config)
-    asyncio.run(tina.run_serve())
+    tina = _app()
+    # Many chats can be persisting / transcribing at once; don't let the
+    # default min(32, cpus + 4) pool throttle to_thread on small hosts
+    _run_async(tina.run_serve(), max_workers=32)
+
+
+@app_cli.command()
+def batch(
+    path: str = typer.Argument(..., help="File of REPL /commands, one per line ('-' for stdin)"),
+):
+    """Run REPL /commands from a file in a single process."""
+    if path == "-":
+        text = sys.stdin.read()
+    else:
+        text = Path(path).read_text(encoding="utf-8")
+    tina = _app()
+
+    async def run():
+        try:
+            for line in text.splitlines():
+                line = line.strip()
+                if not line or line.startswith("#"):
+                    continue
+                if not line.startswith("/"):
+                    console.print(Text(f"Skipping non-command line: {line}", style="yellow"))
+                    continue
+                if await _handle_command(line, tina) == "exit":
+                    break
+        finally:
+            await tina.agent.aclose()
+
+    _run_async(run())
 
 
 @app_cli.command()
 def tasks():
     """List all tasks."""
-    config = Config.load()
-    tina = TinaApp(config)
+    tina = _app()
     task_list = tina.memory.list_tasks()
     if not task_list:
         console.print("No tasks.", style="dim")
     else:
-        for t in task_list:
-            _print_task_info(t)
+        _print_tasks(task_list)
 
 
 @app_cli.command()
 def skills():
     """List loaded skills."""
-    config = Config.load()
-    tina = TinaApp(config)
+    tina = _app()
     skill_list = tina.skills.list_skills()
     if not skill_list:
         console.print("No skills found.", style="dim")
@@ -353,19 +626,27 @@ def schedule_list():
     """List all schedules."""
     from tinabot.scheduler import ScheduleStore
 
-    config = Config.load()
-    store = ScheduleStore(config.memory.data_dir)
+    store = ScheduleStore(_config().memory.data_dir)
     schedules = store.list()
     if not schedules:
         console.print("No schedules.", style="dim")
     else:
+        from rich.table import Table
+
+        # One table, one render; cells are Text so names/crons aren't parsed as markup
+        table = Table(box=None, padding=(0, 2), header_style="bold")
+        for header in ("ID", "Name", "Cron", "Chat", "Status", "Last run"):
+            table.add_column(header)
         for s in schedules:
-            status = "on" if s.enabled else "off"
-            last = s.last_run[:16] if s.last_run else "never"
-            console.print(
-                f"  [{s.id}] {s.name}\n"
-                f"    cron: {s.cron}  chat: {s.chat_id}  status: {status}  last: {last}"
+            table.add_row(
+                Text(s.id),
+                Text(s.name),
+                Text(s.cron),
+                Text(str(s.chat_id)),
+                Text("on", style="green") if s.enabled else Text("off", style="dim"),
+                Text(s.last_run[:16] if s.last_run else "never"),
             )
+        console.print(table)
 
 
 @schedule_cli.command("add")
@@ -376,17 +657,26 @@ def schedule_add(
     chat: int = typer.Option(..., "--chat", help="Telegram chat ID for delivery"),
 ):
     """Add a new schedule."""
-    from croniter import croniter
-    from tinabot.scheduler import ScheduleStore
+    from datetime import datetime, timezone
+
+    from tinabot.scheduler import ScheduleStore, next_fire
 
-    if not croniter.is_valid(cron):
-        console.print(f"Invalid cron expression: {cron}", style="red")
+    # One parse both validates the expression and yields the first run time
+    try:
+        first_run = next_fire(cron, datetime.now(timezone.utc).isoformat())
+    except ValueError as e:  # CroniterError subclasses ValueError
+        console.print(Text(f"Invalid cron expression: {cron} ({e})", style="red"))
         raise typer.Exit(1)
 
-    config = Config.load()
-    store = ScheduleStore(config.memory.data_dir)
+    store = ScheduleStore(_config().memory.data_dir)
     s = store.add(name=name, cron=cron, prompt=prompt, chat_id=chat)
-    console.print(f"Created schedule [{s.id}] {s.name}  cron: {s.cron}", style="green")
+    console.print(
+        Text(
+            f"Created schedule [{s.id}] {s.name}  cron: {s.cron}"
+            f"  next: {first_run:%Y-%m-%d %H:%M} UTC",
+            style="green",
+        )
+    )
 
 
 @schedule_cli.command("del")
@@ -396,8 +686,7 @@ def schedule_del(
     """Remove a schedule."""
     from tinabot.scheduler import ScheduleStore
 
-    config = Config.load()
-    store = ScheduleStore(config.memory.data_dir)
+    store = ScheduleStore(_config().memory.data_dir)
     if store.remove(schedule_id):
         console.print(f"Removed schedule '{schedule_id}'", style="green")
     else:
@@ -411,14 +700,12 @@ app_cli.add_typer(task_cli, name="task")
 @task_cli.command("list")
 def task_list():
     """List all tasks."""
-    config = Config.load()
-    tina = TinaApp(config)
+    tina = _app()
     task_list_ = tina.memory.list_tasks()
     if not task_list_:
         console.print("No tasks.", style="dim")
     else:
-        for t in task_list_:
-            _print_task_info(t)
+        _print_tasks(task_list_)
 
 
 @task_cli.command("del")
@@ -426,14 +713,13 @@ def task_del(
     task_id: str = typer.Argument(..., help="Task ID to delete"),
 ):
     """Delete a task and its associated data."""
-    config = Config.load()
-    tina = TinaApp(config)
+    tina = _app()
     task = tina.memory.get_task(task_id)
     if not task:
         console.print(f"Task '{task_id}' not found", style="yellow")
         raise typer.Exit(1)
     tina.memory.delete_task(task_id)
-    console.print(f"Deleted [{task_id}] {task.name}", style="green")
+    console.print(Text(f"Deleted [{task_id}] {task.name}", style="green"))
 
 
 @task_cli.command("export")
@@ -442,8 +728,7 @@ def task_export(
     output: str = typer.Option(None, "--output", "-o", help="Output file path"),
 ):
     """Export task conversation history as markdown."""
-    config = Config.load()
-    tina = TinaApp(config)
+    tina = _app()
     history = tina.memory.export_task_history(task_id)
     if not history:
         console.print(
@@ -454,8 +739,6 @@ def task_export(
         raise typer.Exit(1)
 
     if output:
-        from pathlib import Path
-
         Path(output).write_text(history, encoding="utf-8")
         console.print(f"Exported to {output}", style="green")
     else:
@@ -488,7 +771,7 @@ def login_openai():
 @login_cli.command("status")
 def login_status():
     """Show current authentication state."""
-    config = Config.load()
+    config = _config()
     provider = config.agent.provider
 
     console.print(f"Provider: {provider}", style="bold")
@@ -539,40 +822,59 @@ model_cli = typer.Typer(help="Manage model selection")
 app_cli.add_typer(model_cli, name="model")
 
 
-def _print_model_list(current_model: str, current_provider: str):
-    """Print all known models grouped by provider, marking current with *."""
-    models = get_known_models()
-    console.print(f"Current: {current_model} ({current_provider})\n")
+@functools.lru_cache(maxsize=1)
+def _models_by_provider() -> dict[str, tuple[tuple[str, float, float], ...]]:
+    """Known models grouped by provider as (name, in_price, out_price).
+
+    The registry is a constant, so the grouping is built once per process.
+    """
+    from tinabot.agent import get_known_models
 
-    # Group by provider
     by_provider: dict[str, list[tuple[str, float, float]]] = {}
-    for name, (provider, inp, out) in models.items():
+    for name, (provider, inp, out) in get_known_models().items():
         by_provider.setdefault(provider, []).append((name, inp, out))
+    return {k: tuple(v) for k, v in by_provider.items()}
+
+
+def _print_model_list(current_model: str, current_provider: str):
+    """Print all known models grouped by provider, marking current with *."""
+    by_provider = _models_by_provider()
+    lines: list[RenderableType] = [
+        Text(f"Current: {current_model} ({current_provider})"),
+        Text(""),
+    ]
 
     for provider_key, label in (("claude", "Claude"), ("openai", "OpenAI")):
-        entries = by_provider.get(provider_key, [])
+        entries = by_provider.get(provider_key, ())
         if not entries:
             continue
-        console.print(f"{label}:", style="bold")
+        lines.append(Text(f"{label}:", style="bold"))
         for name, inp, out in entries:
             marker = "*" if name == current_model else " "
             style = "green" if name == current_model else ""
-            console.print(
-                f"  {marker} {name:<30s}  ${inp:.2f} / ${out:.2f}",
-                style=style,
+            lines.append(
+                Text(f"  {marker} {name:<30s}  ${inp:.2f} / ${out:.2f}", style=style)
             )
-        console.print()
+        lines.append(Text(""))
 
-    console.print(
-        "Tip: Any OpenAI-compatible model works — set base_url in config for custom endpoints.",
-        style="dim",
+    lines.append(
+        Text(
+            "Tip: Any OpenAI-compatible model works — set base_url in config for custom endpoints.",
+            style="dim",
+        )
     )
+    # Whole listing in one Rich render
+    console.print(Group(*lines))
 
 
 def _switch_model(model_name: str) -> tuple[str, str]:
     """Validate and persist a model switch. Returns (model, provider)."""
+    from tinabot.agent import get_known_models, infer_provider
+    from tinabot.config import Config
+
     provider = infer_provider(model_name)
     models = get_known_models()
+    data = Config.load_raw()
 
     if model_name not in models:
         if provider:
@@ -585,21 +887,22 @@ def _switch_model(model_name: str) -> tuple[str, str]:
                 f"Warning: Unknown model '{model_name}' — cannot infer provider, keeping current",
                 style="yellow",
             )
-            # Load current provider as fallback
-            data = Config.load_raw()
+            # Keep the current provider as fallback
             provider = data.get("agent", {}).get("provider", "claude")
 
-    data = Config.load_raw()
     data.setdefault("agent", {})["model"] = model_name
     data["agent"]["provider"] = provider
     Config.save_raw(data)
+    # The cached Config no longer matches the file (a running REPL updates
+    # its own app.config in place instead)
+    _config.cache_clear()
     return model_name, provider
 
 
 @model_cli.command("list")
 def model_list():
     """List all known models with pricing."""
-    config = Config.load()
+    config = _config()
     _print_model_list(config.agent.model, config.agent.provider)
 
 
@@ -617,36 +920,54 @@ app_cli.add_typer(user_cli, name="user")
 
 
 @user_cli.command("add")
-def user_add(user_id: int = typer.Argument(..., help="Telegram user ID to allow")):
-    """Add a user to the Telegram allowlist."""
+def user_add(
+    user_ids: list[int] = typer.Argument(..., help="Telegram user ID(s) to allow"),
+):
+    """Add users to the Telegram allowlist."""
     from tinabot.config import Config
 
     data = Config.load_raw()
     tg = data.setdefault("telegram", {})
     users = tg.setdefault("allowed_users", [])
-    if user_id in users:
-        console.print(f"User {user_id} already in allowlist", style="yellow")
-    else:
-        users.append(user_id)
+    present = set(users)  # O(1) membership; the list keeps insertion order
+    changed = False
+    for user_id in user_ids:
+        if user_id in present:
+            console.print(f"User {user_id} already in allowlist", style="yellow")
+        else:
+            users.append(user_id)
+            present.add(user_id)
+            changed = True
+            console.print(f"Added user {user_id}", style="green")
+    # One write for the whole batch
+    if changed:
         Config.save_raw(data)
-        console.print(f"Added user {user_id}", style="green")
     console.print(f"Allowed users: {users}", style="dim")
 
 
 @user_cli.command("del")
-def user_del(user_id: int = typer.Argument(..., help="Telegram user ID to remove")):
-    """Remove a user from the Telegram allowlist."""
+def user_del(
+    user_ids: list[int] = typer.Argument(..., help="Telegram user ID(s) to remove"),
+):
+    """Remove users from the Telegram allowlist."""
     from tinabot.config import Config
 
     data = Config.load_raw()
     users = data.get("telegram", {}).get("allowed_users", [])
-    if user_id not in users:
-        console.print(f"User {user_id} not in allowlist", style="yellow")
-    else:
-        users.remove(user_id)
+    present = set(users)
+    removed: set[int] = set()
+    for user_id in user_ids:
+        if user_id not in present:
+            console.print(f"User {user_id} not in allowlist", style="yellow")
+        else:
+            present.discard(user_id)
+            removed.add(user_id)
+            console.print(f"Removed user {user_id}", style="green")
+    if removed:
+        # Single pass over the list instead of one list.remove() per ID
+        users = [u for u in users if u not in removed]
         data["telegram"]["allowed_users"] = users
         Config.save_raw(data)
-        console.print(f"Removed user {user_id}", style="green")
     console.print(f"Allowed users: {users}", style="dim")
 
 
@@ -660,9 +981,9 @@ def user_list():
     if not users:
         console.print("Allowlist is empty (all users permitted)", style="dim")
     else:
-        console.print(f"Allowed users ({len(users)}):", style="bold")
-        for uid in users:
-            console.print(f"  {uid}")
+        lines = [Text(f"Allowed users ({len(users)}):", style="bold")]
+        lines.extend(Text(f"  {uid}") for uid in users)
+        console.print(Group(*lines))
 
 
 def main():
@@ -2,13 +2,21 @@
 
 from __future__ import annotations
 
-import json
+import copy
+import os
+import stat
+import tempfile
 from pathlib import Path
 from typing import Any
 
 from pydantic import BaseModel, Field
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
+from tinabot import _json
+
+# Last parsed config.json as (mtime_ns, data), see Config.load_raw()
+_raw_cache: tuple[int, dict[str, Any]] | None = None
+
 
 class AgentConfig(BaseModel):
     """Agent execution settings."""
@@ -22,6 +30,7 @@ class AgentConfig(BaseModel):
     base_url: str = ""  # Custom API endpoint for OpenAI-compatible providers
     max_tokens: int = 16384  # Max output tokens for OpenAI-compatible providers
     timeout_seconds: int = 300  # Max time per agent call (0 = no limit)
+    response_cache_ttl: int = 0  # Reuse identical answers for N seconds (0 = off)
     allowed_tools: list[str] = Field(default_factory=lambda: [
         "Read", "Write", "Edit", "Bash", "Glob", "Grep",
         "WebSearch", "WebFetch", "Task",
@@ -87,11 +96,19 @@ class Config(BaseSettings):
     @classmethod
     def load(cls) -> Config:
         """Load config from file and environment."""
-        config_path = Config.config_path()
-        file_data: dict[str, Any] = {}
-        if config_path.exists():
-            with open(config_path) as f:
-                file_data = json.load(f)
+        file_data = Config.load_raw()
+        # pydantic-settings scans os.environ for every field on each build.
+        # With no TINABOT_* overrides set and only known sections in the
+        # file, validate the sections directly and skip that machinery.
+        if file_data.keys() <= cls.model_fields.keys() and not any(
+            k[:8].upper() == "TINABOT_" for k in os.environ
+        ):
+            return cls.model_construct(
+                **{
+                    name: field.annotation.model_validate(file_data.get(name, {}))
+                    for name, field in cls.model_fields.items()
+                }
+            )
         return cls(**file_data)
 
     @staticmethod
@@ -100,18 +117,43 @@ class Config(BaseSettings):
 
     @staticmethod
     def load_raw() -> dict[str, Any]:
-        """Load raw JSON dict from config file."""
+        """Load raw JSON dict from config file.
+
+        The parsed file is cached until its mtime changes; callers get a
+        private copy they are free to mutate.
+        """
+        global _raw_cache
         path = Config.config_path()
-        if path.exists():
-            with open(path) as f:
-                return json.load(f)
-        return {}
+        try:
+            mtime = path.stat().st_mtime_ns
+        except FileNotFoundError:
+            return {}
+        if _raw_cache is None or _raw_cache[0] != mtime:
+            _raw_cache = (mtime, _json.loads(path.read_bytes()))
+        return copy.deepcopy(_raw_cache[1])
 
     @staticmethod
     def save_raw(data: dict[str, Any]):
-        """Write raw JSON dict to config file."""
+        """Write raw JSON dict to config file.
+
+        Written to a private temp file and renamed into place, so a crash
+        mid-write never leaves a truncated config.json. The file holds API
+        keys, so it keeps the old file's mode (0600 for a new file).
+        """
         path = Config.config_path()
         path.parent.mkdir(parents=True, exist_ok=True)
-        with open(path, "w") as f:
-            json.dump(data, f, indent=2)
-            f.write("\n")
+        try:
+            mode = stat.S_IMODE(path.stat().st_mode)
+        except FileNotFoundError:
+            mode = 0o600
+        fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=".config.", suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(_json.dumps(data, indent=True, newline=True))
+            os.chmod(tmp, mode)
+            os.replace(tmp, path)
+        except BaseException:
+            os.unlink(tmp)
+            raise
+        global _raw_cache
+        _raw_cache = (path.stat().st_mtime_ns, copy.deepcopy(data))
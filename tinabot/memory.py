@@ -2,14 +2,24 @@
 
 from __future__ import annotations
 
+import asyncio
+import atexit
 import json
+import os
 import secrets
+import time
 from dataclasses import dataclass, field, asdict
 from datetime import datetime, timezone
 from pathlib import Path
+from typing import Callable
 
 from loguru import logger
 
+from tinabot import _json
+
+# Minimum gap between tasks.json writes caused only by turn counters
+_SAVE_INTERVAL = 2.0
+
 
 @dataclass
 class Task:
@@ -40,89 +50,198 @@ class TaskMemory:
     def __init__(self, data_dir: str | Path, compress_after_turns: int = 20):
         self.data_dir = Path(data_dir).expanduser()
         self.compress_after_turns = compress_after_turns
+        self._tasks_file = self.data_dir / "tasks.json"
         self._tasks: dict[str, Task] = {}
+        # At most one task is active; its id is kept here
+        self._active_id: str | None = None
+        # mtime of tasks.json as last read or written, see _reload_if_stale()
+        self._mtime_ns: int | None = None
+        # Counter changes not yet written, see _mark_dirty()
+        self._dirty = False
+        self._last_save = 0.0
+        self._save_timer: asyncio.TimerHandle | None = None
+        self._delete_callbacks: list[Callable[[str], None]] = []
         self._load()
+        atexit.register(self.close)
+
+    def on_delete(self, callback: Callable[[str], None]):
+        """Register a callback to run with the task id after delete_task()."""
+        self._delete_callbacks.append(callback)
 
     def _load(self):
         """Load tasks from disk."""
         self.data_dir.mkdir(parents=True, exist_ok=True)
         (self.data_dir / "summaries").mkdir(exist_ok=True)
+        self._read_tasks()
 
-        tasks_file = self.data_dir / "tasks.json"
-        if tasks_file.exists():
-            try:
-                data = json.loads(tasks_file.read_text())
-                for item in data:
-                    task = Task(**item)
-                    self._tasks[task.id] = task
-            except (json.JSONDecodeError, TypeError) as e:
-                logger.warning(f"Failed to load tasks: {e}")
+    def _read_tasks(self):
+        """Parse tasks.json into the in-memory task table."""
+        tasks_file = self._tasks_file
+        try:
+            mtime = tasks_file.stat().st_mtime_ns
+            data = _json.loads(tasks_file.read_bytes())
+            tasks: dict[str, Task] = {}
+            active_id = None
+            # Keep the table in creation order so list_tasks() needs no sort
+            loaded = sorted((Task(**item) for item in data), key=lambda t: t.created_at)
+            for task in loaded:
+                tasks[task.id] = task
+                if task.active:
+                    if active_id is None:
+                        active_id = task.id
+                    else:
+                        task.active = False
+        except FileNotFoundError:
+            return
+        except (ValueError, TypeError) as e:
+            logger.warning(f"Failed to load tasks: {e}")
+            return
+        # On reload, refresh the Task objects callers may still hold (e.g.
+        # the agent mid-turn) instead of swapping in new ones
+        current = self._tasks
+        for task_id, task in tasks.items():
+            existing = current.get(task_id)
+            if existing is not None:
+                vars(existing).update(vars(task))
+                tasks[task_id] = existing
+        self._tasks = tasks
+        self._active_id = active_id
+        self._mtime_ns = mtime
+
+    def _reload_if_stale(self):
+        """Re-read tasks.json if another process changed it.
+
+        Costs one stat() when nothing changed. Skipped while counter
+        changes are pending so they are not thrown away.
+        """
+        if self._dirty:
+            return
+        try:
+            mtime = self._tasks_file.stat().st_mtime_ns
+        except FileNotFoundError:
+            return
+        if mtime != self._mtime_ns:
+            self._read_tasks()
 
     def _save(self):
-        """Persist tasks to disk."""
+        """Persist tasks to disk.
+
+        Written to a temp file, fsynced and renamed into place so a crash
+        never leaves a truncated tasks.json.
+        """
         self.data_dir.mkdir(parents=True, exist_ok=True)
-        tasks_file = self.data_dir / "tasks.json"
+        tasks_file = self._tasks_file
+        tmp = tasks_file.with_suffix(".json.tmp")
         data = [asdict(t) for t in self._tasks.values()]
-        tasks_file.write_text(json.dumps(data, indent=2))
+        with tmp.open("wb") as f:
+            # Machine-managed, so written compact
+            f.write(_json.dumps(data))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, tasks_file)
+        self._mtime_ns = tasks_file.stat().st_mtime_ns
+        self._dirty = False
+        self._last_save = time.monotonic()
+        if self._save_timer is not None:
+            self._save_timer.cancel()
+            self._save_timer = None
+
+    def _mark_dirty(self):
+        """Record a minor change; it is written at most every _SAVE_INTERVAL.
+
+        A change that has to wait is written by a loop timer once the
+        interval has passed (or by close() when there is no running loop).
+        """
+        self._dirty = True
+        wait = _SAVE_INTERVAL - (time.monotonic() - self._last_save)
+        if wait <= 0:
+            self._save()
+            return
+        if self._save_timer is None:
+            try:
+                loop = asyncio.get_running_loop()
+            except RuntimeError:
+                return
+            self._save_timer = loop.call_later(wait, self._on_save_timer)
+
+    def _on_save_timer(self):
+        self._save_timer = None
+        self.flush()
+
+    def flush(self):
+        """Write any pending counter changes."""
+        if self._dirty:
+            self._save()
+
+    def close(self):
+        """Flush pending changes and drop the exit hook."""
+        self.flush()
+        atexit.unregister(self.close)
 
     def create_task(self, name: str) -> Task:
         """Create a new task and set it as active."""
+        self._reload_if_stale()
         task_id = secrets.token_hex(4)  # 8-char hex ID
-        task = Task(id=task_id, name=name[:80], active=True)
-
-        # Deactivate all other tasks
-        for t in self._tasks.values():
-            t.active = False
-
+        # Users type these IDs, so keep them short and retry on collision
+        while task_id in self._tasks:
+            task_id = secrets.token_hex(4)
+        task = Task(id=task_id, name=name[:80])
         self._tasks[task_id] = task
+        self._activate(task)
         self._save()
         logger.info(f"Created task {task_id}: {name[:50]}")
         return task
 
     def get_task(self, task_id: str) -> Task | None:
         """Get a task by ID."""
+        self._reload_if_stale()
         return self._tasks.get(task_id)
 
     def get_active_task(self) -> Task | None:
         """Get the currently active task."""
-        for task in self._tasks.values():
-            if task.active:
-                return task
-        return None
+        self._reload_if_stale()
+        if self._active_id is None:
+            return None
+        return self._tasks.get(self._active_id)
 
     def set_active(self, task_id: str) -> Task | None:
         """Set a task as the active one."""
+        self._reload_if_stale()
         task = self._tasks.get(task_id)
         if not task:
             return None
 
-        for t in self._tasks.values():
-            t.active = False
-        task.active = True
+        self._activate(task)
         self._save()
         return task
 
+    def _activate(self, task: Task):
+        """Make task the only active one."""
+        previous = self._tasks.get(self._active_id) if self._active_id else None
+        if previous is not None:
+            previous.active = False
+        task.active = True
+        self._active_id = task.id
+
     def list_tasks(self) -> list[Task]:
         """List all tasks, most recent first."""
-        return sorted(
-            self._tasks.values(),
-            key=lambda t: t.created_at,
-            reverse=True,
-        )
+        self._reload_if_stale()
+        # The task table is kept in creation order (see _read_tasks)
+        return list(reversed(self._tasks.values()))
 
     def update_session_id(self, task_id: str, session_id: str):
         """Store the SDK session ID for a task."""
         task = self._tasks.get(task_id)
-        if task:
+        if task and task.session_id != session_id:
             task.session_id = session_id
             self._save()
 
-    def increment_turns(self, task_id: str) -> int:
-        """Increment turn count and return new value."""
+    def increment_turns(self, task_id: str, n: int = 1) -> int:
+        """Increment turn count by n and return new value."""
         task = self._tasks.get(task_id)
         if task:
-            task.turn_count += 1
-            self._save()
+            task.turn_count += n
+            self._mark_dirty()
             return task.turn_count
         return 0
 
@@ -142,7 +261,7 @@ class TaskMemory:
 
         # Write summary file
         summary_path = self.data_dir / "summaries" / f"{task_id}.md"
-        summary_path.write_text(summary, encoding="utf-8")
+        summary_path.write_bytes(summary.encode("utf-8"))
 
         # Update task: clear session_id so next interaction starts fresh with summary
         task.summary = summary
@@ -152,16 +271,21 @@ class TaskMemory:
         logger.info(f"Compressed task {task_id}, summary saved")
 
     def get_summary(self, task_id: str) -> str | None:
-        """Get the compressed summary for a task."""
+        """Get the compressed summary for a task.
+
+        Summary and last-response files are plain UTF-8 and are read and
+        written as bytes, skipping the text I/O layer.
+        """
         task = self._tasks.get(task_id)
         if task and task.summary:
             return task.summary
 
         # Try loading from file
         summary_path = self.data_dir / "summaries" / f"{task_id}.md"
-        if summary_path.exists():
-            return summary_path.read_text(encoding="utf-8")
-        return None
+        try:
+            return summary_path.read_bytes().decode("utf-8")
+        except FileNotFoundError:
+            return None
 
     def save_last_response(self, task_id: str, text: str):
         """Save the agent's last response for a task (safety net for context loss)."""
@@ -170,27 +294,31 @@ class TaskMemory:
         resp_dir = self.data_dir / "last_responses"
         resp_dir.mkdir(exist_ok=True)
         # Truncate to avoid huge files (keep last 20k chars — plenty for any report)
-        (resp_dir / f"{task_id}.md").write_text(text[:20000], encoding="utf-8")
+        (resp_dir / f"{task_id}.md").write_bytes(text[:20000].encode("utf-8"))
 
     def get_last_response(self, task_id: str) -> str | None:
         """Get the agent's last response for a task."""
         path = self.data_dir / "last_responses" / f"{task_id}.md"
-        if path.exists():
-            return path.read_text(encoding="utf-8")
-        return None
+        try:
+            return path.read_bytes().decode("utf-8")
+        except FileNotFoundError:
+            return None
 
     def delete_task(self, task_id: str) -> bool:
         """Delete a task and all associated files."""
+        self._reload_if_stale()
         if task_id not in self._tasks:
             return False
 
         del self._tasks[task_id]
+        if task_id == self._active_id:
+            self._active_id = None
         for subdir in ("summaries", "last_responses"):
-            path = self.data_dir / subdir / f"{task_id}.md"
-            if path.exists():
-                path.unlink()
+            (self.data_dir / subdir / f"{task_id}.md").unlink(missing_ok=True)
 
         self._save()
+        for callback in self._delete_callbacks:
+            callback(task_id)
         return True
 
     def export_task_history(self, task_id: str) -> str | None:
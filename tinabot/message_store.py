@@ -1,44 +1,110 @@
 """Per-task message history persistence for non-Claude providers.
 
-Stores OpenAI-format message arrays as JSON files, one per task.
-Storage: ~/.tinabot/data/messages/{task_id}.json
+Stores OpenAI-format messages as JSON lines, one file per task. New
+messages are appended; the file is only rewritten when history is replaced
+or trimmed.
+Storage: ~/.tinabot/data/messages/{task_id}.jsonl
 """
 
 from __future__ import annotations
 
-import json
+import asyncio
+import atexit
+import os
+from collections import OrderedDict
 from pathlib import Path
 
 from loguru import logger
 
+from tinabot import _json
+
+# Writes within this window are coalesced into one write per task
+_FLUSH_DELAY = 0.5
+
+# Histories kept in memory; least recently used ones beyond either limit
+# are dropped (after flushing) and re-read from disk when needed again
+_MAX_CACHED_TASKS = 32
+_MAX_CACHED_BYTES = 64 * 1024 * 1024
+
 
 class MessageStore:
-    """Manages per-task message history on disk with in-memory cache."""
+    """Manages per-task message history on disk with a bounded LRU cache."""
 
     def __init__(self, data_dir: str | Path):
         self._dir = Path(data_dir).expanduser() / "messages"
         self._dir.mkdir(parents=True, exist_ok=True)
-        self._cache: dict[str, list[dict]] = {}
+        self._cache: OrderedDict[str, list[dict]] = OrderedDict()
+        # On-disk size of each cached history as last read or written
+        self._sizes: dict[str, int] = {}
+        self._dirty: set[str] = set()
+        # Number of cached messages already on disk, per task
+        self._synced: dict[str, int] = {}
+        # Tasks whose file must be rewritten rather than appended to
+        self._rewrite: set[str] = set()
+        # Tasks whose cached list is in use by a caller, never evicted
+        self._pins: dict[str, int] = {}
+        self._flush_timer: asyncio.TimerHandle | None = None
+        # Pending writes must not depend on the loop surviving until the
+        # timer fires or on aclose() being reached
+        atexit.register(self.close)
 
     def _path(self, task_id: str) -> Path:
+        return self._dir / f"{task_id}.jsonl"
+
+    def _legacy_path(self, task_id: str) -> Path:
         return self._dir / f"{task_id}.json"
 
     def get_messages(self, task_id: str) -> list[dict]:
-        """Load messages from cache or disk."""
-        if task_id in self._cache:
-            return self._cache[task_id]
-
+        """Load messages from cache or disk.
+
+        The returned list is the cached one; add to it through
+        append_message()/append_messages() so the store sees the change.
+        """
+        msgs = self._cache.get(task_id)
+        if msgs is not None:
+            self._cache.move_to_end(task_id)
+            return msgs
+
+        msgs = []
+        size = 0
         path = self._path(task_id)
-        if path.exists():
+        legacy = self._legacy_path(task_id)
+        try:
+            raw = path.read_bytes()
+        except FileNotFoundError:
+            raw = None
+        except OSError as e:
+            raw = b""
+            logger.warning(f"Failed to load messages for {task_id}: {e}")
+        if raw is not None:
+            size = len(raw)
+            for line in raw.splitlines():
+                if not line.strip():
+                    continue
+                try:
+                    msgs.append(_json.loads(line))
+                except ValueError:
+                    # Torn append from a crash; the rewrite below drops it
+                    logger.warning(f"Skipping corrupt message line for {task_id}")
+                    self._rewrite.add(task_id)
+        else:
+            # Pre-JSONL history: convert it once
             try:
-                msgs = json.loads(path.read_text(encoding="utf-8"))
-                self._cache[task_id] = msgs
-                return msgs
-            except (json.JSONDecodeError, Exception) as e:
+                msgs = _json.loads(legacy.read_bytes())
+                self._rewrite.add(task_id)
+            except FileNotFoundError:
+                pass
+            except Exception as e:
                 logger.warning(f"Failed to load messages for {task_id}: {e}")
 
-        self._cache[task_id] = []
-        return self._cache[task_id]
+        self._cache[task_id] = msgs
+        self._sizes[task_id] = size
+        self._synced[task_id] = len(msgs)
+        # Drop the pre-JSONL file only once its contents are safely on disk
+        if task_id in self._rewrite and self._write(task_id):
+            legacy.unlink(missing_ok=True)
+        self._evict()
+        return msgs
 
     def append_message(self, task_id: str, message: dict):
         """Append a message and persist to disk."""
@@ -55,38 +121,132 @@ class MessageStore:
     def set_messages(self, task_id: str, messages: list[dict]):
         """Replace all messages for a task."""
         self._cache[task_id] = messages
+        self._cache.move_to_end(task_id)
+        self._rewrite.add(task_id)
         self._persist(task_id)
 
     def trim_to_budget(self, task_id: str, max_messages: int = 100):
-        """Keep system message (if first) + last N messages."""
-        msgs = self.get_messages(task_id)
-        if len(msgs) <= max_messages:
-            return
+        """Keep system message (if first) + last N messages.
 
+        Trims the cached list in place, so callers holding it stay in sync.
+        """
+        msgs = self.get_messages(task_id)
         # Preserve system message if it's the first one
-        if msgs and msgs[0].get("role") == "system":
-            system = [msgs[0]]
-            rest = msgs[1:]
-        else:
-            system = []
-            rest = msgs
+        start = 1 if msgs and msgs[0].get("role") == "system" else 0
+        excess = len(msgs) - start - max_messages
+        if excess <= 0:
+            return
 
-        trimmed = system + rest[-max_messages:]
-        self._cache[task_id] = trimmed
+        del msgs[start:start + excess]
+        self._rewrite.add(task_id)
         self._persist(task_id)
 
     def clear(self, task_id: str):
         """Clear all messages for a task."""
         self._cache.pop(task_id, None)
-        path = self._path(task_id)
-        if path.exists():
-            path.unlink()
+        self._sizes.pop(task_id, None)
+        self._synced.pop(task_id, None)
+        self._dirty.discard(task_id)
+        self._rewrite.discard(task_id)
+        self._path(task_id).unlink(missing_ok=True)
+        self._legacy_path(task_id).unlink(missing_ok=True)
+
+    def flush(self, task_id: str | None = None):
+        """Write pending changes now, for one task or all of them."""
+        if task_id is not None:
+            if task_id in self._dirty:
+                self._dirty.discard(task_id)
+                self._write(task_id)
+            return
+        if self._flush_timer is not None:
+            self._flush_timer.cancel()
+            self._flush_timer = None
+        dirty, self._dirty = self._dirty, set()
+        for tid in dirty:
+            self._write(tid)
+
+    def close(self):
+        """Flush everything still pending and drop the exit hook.
+
+        The atexit entry would otherwise keep a replaced store (e.g. after a
+        model switch) and all its cached histories alive until exit.
+        """
+        self.flush()
+        atexit.unregister(self.close)
 
     def _persist(self, task_id: str):
-        """Write cached messages to disk."""
+        """Mark a task dirty; the write happens on the next flush.
+
+        Outside a running event loop there is nothing to schedule the
+        flush on, so the write happens immediately.
+        """
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            self._dirty.discard(task_id)
+            self._write(task_id)
+            return
+        self._dirty.add(task_id)
+        if self._flush_timer is None:
+            self._flush_timer = loop.call_later(_FLUSH_DELAY, self._on_timer)
+
+    def pin(self, task_id: str):
+        """Keep a task's cached list alive until the matching unpin()."""
+        self._pins[task_id] = self._pins.get(task_id, 0) + 1
+
+    def unpin(self, task_id: str):
+        n = self._pins.get(task_id, 0) - 1
+        if n > 0:
+            self._pins[task_id] = n
+        else:
+            self._pins.pop(task_id, None)
+            self._evict()
+
+    def _evict(self):
+        """Drop least recently used histories beyond the cache limits.
+
+        The most recently used task and pinned tasks are always kept.
+        """
+        cache = self._cache
+        total = sum(self._sizes.values())
+        for task_id in list(cache)[:-1]:
+            if len(cache) <= _MAX_CACHED_TASKS and total <= _MAX_CACHED_BYTES:
+                break
+            if task_id in self._pins:
+                continue
+            self.flush(task_id)
+            del cache[task_id]
+            total -= self._sizes.pop(task_id, 0)
+            self._synced.pop(task_id, None)
+
+    def _on_timer(self):
+        self._flush_timer = None
+        self.flush()
+
+    def _write(self, task_id: str) -> bool:
+        """Write cached messages to disk; returns False if the write failed.
+
+        Appends only the messages added since the last write; replaced or
+        trimmed histories are rewritten via a temp file and os.replace().
+        """
         msgs = self._cache.get(task_id, [])
+        synced = self._synced.get(task_id, 0)
         path = self._path(task_id)
         try:
-            path.write_text(json.dumps(msgs, ensure_ascii=False), encoding="utf-8")
+            if task_id in self._rewrite or synced > len(msgs):
+                data = b"".join(_json.dumps(m, newline=True) for m in msgs)
+                tmp = path.with_suffix(".jsonl.tmp")
+                tmp.write_bytes(data)
+                os.replace(tmp, path)
+                self._rewrite.discard(task_id)
+                self._sizes[task_id] = len(data)
+            elif synced < len(msgs):
+                data = b"".join(_json.dumps(m, newline=True) for m in msgs[synced:])
+                with path.open("ab") as f:
+                    f.write(data)
+                self._sizes[task_id] = self._sizes.get(task_id, 0) + len(data)
+            self._synced[task_id] = len(msgs)
         except Exception as e:
             logger.error(f"Failed to persist messages for {task_id}: {e}")
+            return False
+        return True
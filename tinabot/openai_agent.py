@@ -23,6 +23,8 @@ import httpx
 from loguru import logger
 from openai import AsyncOpenAI
 
+from tinabot import _json
+from tinabot._util import is_async_callable
 from tinabot.config import AgentConfig
 from tinabot.message_store import MessageStore
 from tinabot.tools import get_tool_schemas, get_codex_tool_schemas, execute_tool
@@ -58,15 +60,18 @@ class OpenAIAgent:
         config: AgentConfig,
         message_store: MessageStore,
         auth: OpenAIAuth | None = None,
+        cwd: str | None = None,
     ):
         self.config = config
         self.message_store = message_store
         self._auth = auth
-        # Resolve cwd: expand ~ and ensure directory exists
-        from pathlib import Path
-        cwd = Path(config.cwd).expanduser()
-        cwd.mkdir(parents=True, exist_ok=True)
-        self._cwd = str(cwd)
+        if cwd is None:
+            # Resolve cwd: expand ~ and ensure directory exists
+            from pathlib import Path
+            resolved = Path(config.cwd).expanduser()
+            resolved.mkdir(parents=True, exist_ok=True)
+            cwd = str(resolved)
+        self._cwd = cwd
         self._client = AsyncOpenAI(
             api_key=config.api_key or "placeholder",
             base_url=config.resolved_base_url(),
@@ -100,96 +105,104 @@ class OpenAIAgent:
         tools = get_tool_schemas(self.config.allowed_tools)
         cwd = self._cwd
 
-        # Load or initialize message history
-        messages = self.message_store.get_messages(task_id)
+        # Load or initialize message history. This is the store's cached
+        # list, so new messages go through append_message(s) and only they
+        # are written out.
+        store = self.message_store
+        messages = store.get_messages(task_id)
+        # Keep that list cached for the whole run; if it were evicted, later
+        # appends would go to a reloaded copy and not reach the API calls
+        store.pin(task_id)
         if not messages:
             messages.append({"role": "system", "content": system_prompt})
         else:
-            # Update system prompt in case it changed
+            # Update system prompt in case it changed; it is set again on
+            # every run, so the copy on disk is allowed to lag behind
             if messages[0].get("role") == "system":
                 messages[0]["content"] = system_prompt
 
-        # Build user message content
-        user_content: str | list[dict] = user_message
-        if images:
-            content_parts: list[dict] = []
-            for img in images:
-                content_parts.append({
-                    "type": "image_url",
-                    "image_url": {
-                        "url": f"data:{img['media_type']};base64,{img['data']}",
-                    },
-                })
-            content_parts.append({"type": "text", "text": user_message})
-            user_content = content_parts
-
-        messages.append({"role": "user", "content": user_content})
-        self.message_store.set_messages(task_id, messages)
+        try:
+            # Build user message content
+            user_content: str | list[dict] = user_message
+            if images:
+                content_parts: list[dict] = []
+                for img in images:
+                    content_parts.append({
+                        "type": "image_url",
+                        "image_url": {
+                            "url": f"data:{img['media_type']};base64,{img['data']}",
+                        },
+                    })
+                content_parts.append({"type": "text", "text": user_message})
+                user_content = content_parts
+
+            store.append_message(task_id, {"role": "user", "content": user_content})
+
+            # Agent loop
+            for iteration in range(MAX_TOOL_ITERATIONS):
+                text, tool_calls, usage = await self._stream_completion(
+                    messages, tools, on_text, on_tool
+                )
 
-        # Agent loop
-        for iteration in range(MAX_TOOL_ITERATIONS):
-            text, tool_calls, usage = await self._stream_completion(
-                messages, tools, on_text, on_tool
-            )
+                result.input_tokens += usage.get("input", 0)
+                result.output_tokens += usage.get("output", 0)
+                result.num_turns += 1
 
-            result.input_tokens += usage.get("input", 0)
-            result.output_tokens += usage.get("output", 0)
-            result.num_turns += 1
+                if not tool_calls:
+                    # No tool calls — we're done
+                    result.text = text
+                    # Save assistant response to history
+                    if text:
+                        store.append_message(task_id, {"role": "assistant", "content": text})
+                    break
 
-            if not tool_calls:
-                # No tool calls — we're done
-                result.text = text
-                # Save assistant response to history
+                # Build assistant message with tool calls
+                assistant_msg: dict[str, Any] = {"role": "assistant"}
                 if text:
-                    messages.append({"role": "assistant", "content": text})
-                    self.message_store.set_messages(task_id, messages)
-                break
-
-            # Build assistant message with tool calls
-            assistant_msg: dict[str, Any] = {"role": "assistant"}
-            if text:
-                assistant_msg["content"] = text
-            else:
-                assistant_msg["content"] = None
-            assistant_msg["tool_calls"] = [
-                {
-                    "id": tc["id"],
-                    "type": "function",
-                    "function": {
-                        "name": tc["name"],
-                        "arguments": tc["arguments"],
-                    },
-                }
-                for tc in tool_calls
-            ]
-            messages.append(assistant_msg)
-
-            # Execute tools and append results
-            for tc in tool_calls:
-                result.tool_uses.append(tc["name"])
-                try:
-                    args = json.loads(tc["arguments"])
-                except json.JSONDecodeError:
-                    args = {}
+                    assistant_msg["content"] = text
+                else:
+                    assistant_msg["content"] = None
+                assistant_msg["tool_calls"] = [
+                    {
+                        "id": tc["id"],
+                        "type": "function",
+                        "function": {
+                            "name": tc["name"],
+                            "arguments": tc["arguments"],
+                        },
+                    }
+                    for tc in tool_calls
+                ]
+                turn: list[dict] = [assistant_msg]
+
+                # Execute tools and append results
+                for tc in tool_calls:
+                    result.tool_uses.append(tc["name"])
+                    try:
+                        args = _json.loads(tc["arguments"])
+                    except json.JSONDecodeError:
+                        args = {}
 
-                tool_result = await execute_tool(tc["name"], args, cwd)
-                messages.append({
-                    "role": "tool",
-                    "tool_call_id": tc["id"],
-                    "content": tool_result,
-                })
+                    tool_result = await execute_tool(tc["name"], args, cwd)
+                    turn.append({
+                        "role": "tool",
+                        "tool_call_id": tc["id"],
+                        "content": tool_result,
+                    })
 
-            self.message_store.set_messages(task_id, messages)
-        else:
-            # Hit max iterations
-            result.text = (text or "") + (
-                "\n\n(Reached maximum tool call iterations.)"
-            )
+                store.append_messages(task_id, turn)
+            else:
+                # Hit max iterations
+                result.text = (text or "") + (
+                    "\n\n(Reached maximum tool call iterations.)"
+                )
 
-        # Trim message history to prevent unbounded growth
-        self.message_store.trim_to_budget(task_id, max_messages=100)
+            # Trim message history to prevent unbounded growth
+            store.trim_to_budget(task_id, max_messages=100)
 
-        return result
+            return result
+        finally:
+            store.unpin(task_id)
 
     async def _stream_completion(
         self,
@@ -206,7 +219,11 @@ class OpenAIAgent:
         """
         text_parts: list[str] = []
         tool_calls_by_index: dict[int, dict] = {}
+        # Argument fragments per tool call, joined once the stream ends
+        arg_parts_by_index: dict[int, list[str]] = {}
         usage = {"input": 0, "output": 0}
+        on_text_async = is_async_callable(on_text)
+        on_tool_async = is_async_callable(on_tool)
 
         kwargs: dict[str, Any] = {
             "model": self.config.model,
@@ -236,7 +253,7 @@ class OpenAIAgent:
                 text_parts.append(delta.content)
                 if on_text:
                     r = on_text(delta.content)
-                    if hasattr(r, "__await__"):
+                    if on_text_async:
                         await r
 
             # Tool call deltas
@@ -249,6 +266,7 @@ class OpenAIAgent:
                             "name": "",
                             "arguments": "",
                         }
+                        arg_parts_by_index[idx] = []
                     tc = tool_calls_by_index[idx]
                     if tc_delta.id:
                         tc["id"] = tc_delta.id
@@ -256,7 +274,9 @@ class OpenAIAgent:
                         if tc_delta.function.name:
                             tc["name"] = tc_delta.function.name
                         if tc_delta.function.arguments:
-                            tc["arguments"] += tc_delta.function.arguments
+                            arg_parts_by_index[idx].append(
+                                tc_delta.function.arguments
+                            )
 
         text = "".join(text_parts)
 
@@ -265,16 +285,18 @@ class OpenAIAgent:
             tool_calls_by_index[i]
             for i in sorted(tool_calls_by_index)
         ]
+        for i, tc in tool_calls_by_index.items():
+            tc["arguments"] = "".join(arg_parts_by_index[i])
 
         # Fire on_tool callbacks for completed tool calls
         if on_tool and tool_calls:
             for tc in tool_calls:
                 try:
-                    args = json.loads(tc["arguments"])
+                    args = _json.loads(tc["arguments"])
                 except json.JSONDecodeError:
                     args = {}
                 r = on_tool(tc["name"], args)
-                if hasattr(r, "__await__"):
+                if on_tool_async:
                     await r
 
         return text, tool_calls, usage
@@ -332,12 +354,15 @@ class OpenAIAgent:
                     "image_url": f"data:{img['media_type']};base64,{img['data']}",
                 })
             content.append({"type": "input_text", "text": user_message})
-            history.append({"role": "user", "content": content})
+            user_item: dict[str, Any] = {"role": "user", "content": content}
         else:
-            history.append({"role": "user", "content": user_message})
+            user_item = {"role": "user", "content": user_message}
+
+        # Items added this turn; appended to the stored history at the end
+        turn: list[dict[str, Any]] = [user_item]
 
         # Build input_items = full history (for the API call within this turn)
-        input_items: list[dict[str, Any]] = list(history)
+        input_items: list[dict[str, Any]] = [*history, user_item]
 
         # Agent loop (tool-calling iterations within a single turn)
         for iteration in range(MAX_TOOL_ITERATIONS):
@@ -361,18 +386,18 @@ class OpenAIAgent:
                 result.text = text
                 # Save assistant text to history
                 if text:
-                    history.append({"role": "assistant", "content": text})
+                    turn.append({"role": "assistant", "content": text})
                 break
 
             # Append model output items (function_calls) + tool results
             for item in output_items:
                 input_items.append(item)
-                history.append(item)
+                turn.append(item)
 
             for fc in func_calls:
                 result.tool_uses.append(fc["name"])
                 try:
-                    args = json.loads(fc["arguments"])
+                    args = _json.loads(fc["arguments"])
                 except json.JSONDecodeError:
                     args = {}
 
@@ -383,14 +408,14 @@ class OpenAIAgent:
                     "output": tool_result,
                 }
                 input_items.append(output_item)
-                history.append(output_item)
+                turn.append(output_item)
         else:
             result.text = (text or "") + (
                 "\n\n(Reached maximum tool call iterations.)"
             )
 
         # Persist conversation history
-        self.message_store.set_messages(task_id, history)
+        self.message_store.append_messages(task_id, turn)
         self.message_store.trim_to_budget(task_id, max_messages=100)
 
         return result
@@ -438,6 +463,8 @@ class OpenAIAgent:
         usage = {"input": 0, "output": 0}
         response_id: str | None = None
         output_items: list[dict] = []
+        on_text_async = is_async_callable(on_text)
+        on_tool_async = is_async_callable(on_tool)
 
         async with httpx.AsyncClient(timeout=httpx.Timeout(300.0, connect=30.0)) as client:
             async with client.stream(
@@ -458,7 +485,7 @@ class OpenAIAgent:
                         break
 
                     try:
-                        event = json.loads(data_str)
+                        event = _json.loads(data_str)
                     except json.JSONDecodeError:
                         continue
 
@@ -471,7 +498,7 @@ class OpenAIAgent:
                             text_parts.append(delta)
                             if on_text:
                                 r = on_text(delta)
-                                if hasattr(r, "__await__"):
+                                if on_text_async:
                                     await r
 
                     # Function call argument streaming (accumulated;
@@ -492,11 +519,11 @@ class OpenAIAgent:
                             func_calls_list.append(fc)
                             if on_tool:
                                 try:
-                                    args = json.loads(fc["arguments"])
+                                    args = _json.loads(fc["arguments"])
                                 except json.JSONDecodeError:
                                     args = {}
                                 r = on_tool(fc["name"], args)
-                                if hasattr(r, "__await__"):
+                                if on_tool_async:
                                     await r
 
                     # Response completed
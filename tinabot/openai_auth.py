@@ -103,14 +103,14 @@ class OpenAIAuth:
 
     def _load(self):
         """Load tokens from disk."""
-        if not TOKEN_FILE.exists():
-            return
         try:
             data = json.loads(TOKEN_FILE.read_text())
             self._access_token = data.get("access_token")
             self._refresh_token = data.get("refresh_token")
             self._expires_at = data.get("expires_at", 0.0)
             self._account_id = data.get("account_id")
+        except FileNotFoundError:
+            pass
         except Exception as e:
             logger.warning(f"Failed to load OAuth tokens: {e}")
 
@@ -0,0 +1,60 @@
+"""REPL input history persisted off the event loop."""
+
+from __future__ import annotations
+
+import atexit
+import datetime
+import queue
+import threading
+
+from prompt_toolkit.history import FileHistory
+
+
+class BackgroundFileHistory(FileHistory):
+    """FileHistory whose appends are written by a background thread.
+
+    prompt_toolkit calls store_string() on the event loop for every accepted
+    line; here that only queues the entry. A writer thread keeps the file
+    open and flushes once per burst. Same on-disk format as FileHistory.
+    """
+
+    def __init__(self, filename: str):
+        super().__init__(filename)
+        self._queue: queue.SimpleQueue[str | None] = queue.SimpleQueue()
+        self._closed = False
+        self._thread = threading.Thread(
+            target=self._writer, name="repl-history", daemon=True
+        )
+        self._thread.start()
+        atexit.register(self.close)
+
+    def store_string(self, string: str) -> None:
+        lines = "".join(f"+{line}\n" for line in string.split("\n"))
+        self._queue.put(f"\n# {datetime.datetime.now()}\n{lines}")
+
+    def _writer(self):
+        entry = self._queue.get()
+        if entry is None:
+            return
+        with open(self.filename, "ab", buffering=8192) as f:
+            while True:
+                # Write everything already queued, then flush once
+                while entry is not None:
+                    f.write(entry.encode("utf-8"))
+                    try:
+                        entry = self._queue.get_nowait()
+                    except queue.Empty:
+                        break
+                f.flush()
+                if entry is None:
+                    return
+                entry = self._queue.get()
+
+    def close(self):
+        """Write out queued entries and stop the writer thread."""
+        if self._closed:
+            return
+        self._closed = True
+        atexit.unregister(self.close)
+        self._queue.put(None)
+        self._thread.join(timeout=5)
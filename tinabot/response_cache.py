@@ -0,0 +1,53 @@
+"""Short-lived exact-match cache for agent responses.
+
+Lets byte-identical requests (retries, repeated scheduled prompts) skip the
+model call entirely within a TTL window. Entries live in memory only.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import time
+from collections import OrderedDict
+from typing import Any
+
+# Only answers whose tool calls all come from this read-only set may be
+# replayed; anything else (Bash, edits, MCP/skill tools) must run again
+READ_ONLY_TOOLS = frozenset({"Read", "Glob", "Grep", "WebSearch", "WebFetch"})
+
+
+class ResponseCache:
+    """In-memory LRU of responses keyed by a hash of the full request."""
+
+    def __init__(self, ttl: float = 300, max_entries: int = 256):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries: OrderedDict[str, tuple[float, Any]] = OrderedDict()
+
+    @staticmethod
+    def make_key(*parts: str | None) -> str:
+        """Hash request components into a cache key."""
+        h = hashlib.blake2b(digest_size=20)
+        for part in parts:
+            h.update((part or "").encode("utf-8"))
+            h.update(b"\x1f")
+        return h.hexdigest()
+
+    def get(self, key: str) -> Any | None:
+        """Return the cached value, or None if missing or expired."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at < time.monotonic():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return value
+
+    def put(self, key: str, value: Any):
+        """Store a value, evicting the least recently used entry if full."""
+        self._entries[key] = (time.monotonic() + self.ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
@@ -3,6 +3,7 @@
 from __future__ import annotations
 
 import asyncio
+import functools
 import json
 import uuid
 from dataclasses import dataclass, field, asdict
@@ -10,7 +11,6 @@ from datetime import datetime, timezone
 from pathlib import Path
 from typing import Any, Callable, Awaitable
 
-from croniter import croniter
 from loguru import logger
 
 
@@ -56,10 +56,7 @@ class ScheduleStore:
 
     def get(self, schedule_id: str) -> Schedule | None:
         """Get a schedule by ID (filename stem)."""
-        p = self._dir / f"{schedule_id}.json"
-        if p.exists():
-            return self._load(p)
-        return None
+        return self._load(self._dir / f"{schedule_id}.json")
 
     def add(
         self,
@@ -87,11 +84,11 @@ class ScheduleStore:
 
     def remove(self, schedule_id: str) -> bool:
         """Remove a schedule file. Returns True if it existed."""
-        p = self._dir / f"{schedule_id}.json"
-        if p.exists():
-            p.unlink()
-            return True
-        return False
+        try:
+            (self._dir / f"{schedule_id}.json").unlink()
+        except FileNotFoundError:
+            return False
+        return True
 
     def update_last_run(self, schedule_id: str, timestamp: str):
         """Update last_run for a schedule."""
@@ -104,6 +101,8 @@ class ScheduleStore:
         try:
             data = json.loads(path.read_text())
             return Schedule(id=path.stem, **data)
+        except FileNotFoundError:
+            return None
         except Exception as e:
             logger.warning(f"Failed to load schedule {path.name}: {e}")
             return None
@@ -116,6 +115,21 @@ class ScheduleStore:
 SendFn = Callable[[int, str], Awaitable[None]]
 
 
+@functools.lru_cache(maxsize=256)
+def next_fire(cron: str, base_str: str) -> datetime:
+    """Next fire time of ``cron`` after the ISO timestamp ``base_str``.
+
+    Memoized: the scheduler polls every 30s but (cron, base) only changes
+    when a schedule runs, so croniter parses each expression once per run.
+    """
+    from croniter import croniter
+
+    base = datetime.fromisoformat(base_str)
+    if base.tzinfo is None:
+        base = base.replace(tzinfo=timezone.utc)
+    return croniter(cron, base).get_next(datetime)
+
+
 class Scheduler:
     """Background loop that checks for due schedules and executes them."""
 
@@ -160,14 +174,7 @@ class Scheduler:
             base_str = schedule.last_run or schedule.created_at
             if not base_str:
                 return False
-            base = datetime.fromisoformat(base_str)
-            if base.tzinfo is None:
-                base = base.replace(tzinfo=timezone.utc)
-
-            cron = croniter(schedule.cron, base)
-            next_time = cron.get_next(datetime)
-            now = datetime.now(timezone.utc)
-            return next_time <= now
+            return next_fire(schedule.cron, base_str) <= datetime.now(timezone.utc)
         except Exception as e:
             logger.warning(f"Schedule '{schedule.id}' cron error: {e}")
             return False
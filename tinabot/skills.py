@@ -6,6 +6,7 @@ import os
 import re
 import shutil
 from pathlib import Path
+from typing import Callable
 
 from loguru import logger
 
@@ -20,6 +21,17 @@ class SkillsLoader:
     def __init__(self, skills_dir: str | Path):
         self.skills_dir = Path(skills_dir).expanduser()
         self._cache: dict[str, dict] = {}
+        self._reload_callbacks: list[Callable[[], None]] = []
+
+    def on_reload(self, callback: Callable[[], None]):
+        """Register a callback to run after every reload()."""
+        self._reload_callbacks.append(callback)
+
+    def reload(self):
+        """Drop cached skill metadata so changes on disk are picked up."""
+        self._cache.clear()
+        for callback in self._reload_callbacks:
+            callback()
 
     def list_skills(self, filter_unavailable: bool = True) -> list[dict[str, str]]:
         """List all discovered skills."""
@@ -200,6 +200,8 @@ class TelegramBot:
         self.agent = agent
         self.memory = memory
         self.schedule_store = schedule_store
+        # Checked on every update; the allowlist is fixed for the bot's lifetime
+        self._allowed_users = frozenset(config.allowed_users)
         self._app: Application | None = None
         self._chat_tasks: dict[int, str] = {}  # chat_id -> task_id
         self._chat_tasks_path = Path(memory.data_dir) / "chat_tasks.json"
@@ -216,15 +218,16 @@ class TelegramBot:
 
     def _load_chat_tasks(self):
         """Load chat_id -> task_id mapping from disk."""
-        if self._chat_tasks_path.exists():
-            try:
-                data = json.loads(self._chat_tasks_path.read_text())
-                for chat_id_str, task_id in data.items():
-                    # Validate that task still exists
-                    if self.memory.get_task(task_id):
-                        self._chat_tasks[int(chat_id_str)] = task_id
-            except Exception as e:
-                logger.warning(f"Failed to load chat_tasks: {e}")
+        try:
+            data = json.loads(self._chat_tasks_path.read_text())
+            for chat_id_str, task_id in data.items():
+                # Validate that task still exists
+                if self.memory.get_task(task_id):
+                    self._chat_tasks[int(chat_id_str)] = task_id
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            logger.warning(f"Failed to load chat_tasks: {e}")
 
     def _save_chat_tasks(self):
         """Persist chat_id -> task_id mapping to disk."""
@@ -233,7 +236,7 @@ class TelegramBot:
 
     def _is_allowed(self, user_id: int) -> bool:
         """Check if user is in allowlist. Empty list = deny all."""
-        return user_id in self.config.allowed_users
+        return user_id in self._allowed_users
 
     async def _check_allowed(self, update: Update) -> bool:
         """Check permission and reply with user ID if denied."""
@@ -565,6 +568,8 @@ class TelegramBot:
         if not update.message or not await self._check_allowed(update):
             return
 
+        # Re-scan so newly installed skills reach the agent's system prompt
+        self.agent.skills.reload()
         skills = self.agent.skills.list_skills()
         if not skills:
             await update.message.reply_text("No skills loaded.")
@@ -8,6 +8,7 @@ Provides tools (Bash, Read, Write, Glob, Grep, WebFetch) with:
 from __future__ import annotations
 
 import asyncio
+import functools
 import shutil
 from pathlib import Path
 
@@ -175,20 +176,23 @@ TOOL_SCHEMAS: dict[str, dict] = {
 
 def get_tool_schemas(allowed_tools: list[str]) -> list[dict]:
     """Return tool schemas filtered by the allowed tools list."""
-    return [
-        TOOL_SCHEMAS[name]
-        for name in allowed_tools
-        if name in TOOL_SCHEMAS
-    ]
+    return list(_tool_schemas(tuple(dict.fromkeys(allowed_tools))))
 
 
 def get_codex_tool_schemas(allowed_tools: list[str]) -> list[dict]:
     """Return tool schemas in Responses API format (type=function at top level)."""
+    return list(_codex_tool_schemas(tuple(dict.fromkeys(allowed_tools))))
+
+
+@functools.lru_cache(maxsize=16)
+def _tool_schemas(names: tuple[str, ...]) -> tuple[dict, ...]:
+    return tuple(TOOL_SCHEMAS[name] for name in names if name in TOOL_SCHEMAS)
+
+
+@functools.lru_cache(maxsize=16)
+def _codex_tool_schemas(names: tuple[str, ...]) -> tuple[dict, ...]:
     result = []
-    for name in allowed_tools:
-        schema = TOOL_SCHEMAS.get(name)
-        if not schema:
-            continue
+    for schema in _tool_schemas(names):
         func = schema["function"]
         result.append({
             "type": "function",
@@ -196,7 +200,7 @@ def get_codex_tool_schemas(allowed_tools: list[str]) -> list[dict]:
             "description": func["description"],
             "parameters": func["parameters"],
         })
-    return result
+    return tuple(result)
 
 
 # ---------------------------------------------------------------------------